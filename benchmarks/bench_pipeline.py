@@ -0,0 +1,182 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+"""Measure every stage of the spec to code pipeline on a synthetic spec.
+
+python -m benchmarks.bench_pipeline [--paths N] [--schemas N] [--one-of-depth N] [--ref-fan-out N] [--json PATH]
+
+Stages are timed with the best of `--repeat` runs, then run once more under tracemalloc for their peak memory, as
+tracing slows them down.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import pathlib
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+import yaml
+from jinja2 import ChoiceLoader, DictLoader
+
+from benchmarks.synthetic import SpecShape, synthetic_spec
+from datadog_api_client_generator.codegen.shared.base_codegen import BaseCodegen, GeneratorConfig
+from datadog_api_client_generator.codegen.shared.render import RenderJob
+from datadog_api_client_generator.codegen.shared.writer import OutputWriter
+from datadog_api_client_generator.openapi.loader import validate_spec
+from datadog_api_client_generator.openapi.utils import parse_spec
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import PosixPath
+
+    from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+
+STAGES = ("load", "validate", "schemas_by_name", "group_apis_by_tag", "render")
+
+# Templates using the spec the way client generators do: parameters, return types and models of operations.
+REFERENCE_TEMPLATES = {
+    "api.j2": """\
+class {{ tag | camel_case }}Api:
+{%- for path, method, operation in operations %}
+    def {{ operation.operationId | snake_case }}(self
+    {%- for name, parameter in operation.get_parameters() %}, {{ name | snake_case }}{% endfor %}):
+        # {{ method | upper }} {{ path }} {{ operation.get_accept_headers() | join(", ") }}
+        {%- set returned = operation.get_return_schema() %}
+        return {{ returned.name if returned else "None" }}
+{%- endfor %}
+""",
+    "model.j2": """\
+class {{ model.name }}:
+{%- for name, schema in model.properties.items() %}
+    {{ name | snake_case }}: {{ schema().name or schema().type or "object" }}
+{%- endfor %}
+    # uses {% for name in model.schemas_by_name(recursive=False, include_self=False) %}{{ name }} {% endfor %}
+""",
+}
+
+
+class ReferenceCodegen(BaseCodegen):
+    """Generator rendering one file per tag and one file per model, used as a reference render."""
+
+    generator_config = GeneratorConfig()
+
+    def _build_env(self, **kwargs: Any) -> Any:
+        env = super()._build_env(**kwargs)
+        env.loader = ChoiceLoader([env.loader, DictLoader(REFERENCE_TEMPLATES)])
+        return env
+
+    def generate(self, specs: dict[str, OpenAPI], output: PosixPath) -> None:
+        writer = OutputWriter(output, atomic=False)
+        for version, spec in specs.items():
+            jobs = [
+                RenderJob("api.j2", f"{version}/apis/{tag}.py", {"tag": tag or "default", "operations": operations})
+                for tag, operations in spec.group_apis_by_tag().items()
+            ]
+            jobs.extend(
+                RenderJob("model.j2", f"{version}/models/{name}.py", {"model": model})
+                for name, model in spec.schemas_by_name().items()
+                if getattr(model, "properties", None)
+            )
+            for job, content in zip(jobs, self.render(jobs), strict=True):
+                writer.write(job.output, content)
+        writer.commit()
+
+
+@dataclass
+class StageResult:
+    stage: str
+    seconds: float
+    peak_bytes: int | None = None
+
+
+def _measure(function: Callable[[], Any], *, trace_memory: bool) -> tuple[Any, float, int | None]:
+    gc.collect()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - baseline if trace_memory else None
+    return result, seconds, peak
+
+
+def run_pipeline(spec_path: PosixPath, output: PosixPath, *, trace_memory: bool = False) -> list[StageResult]:
+    """Run every stage once on the spec file and return their measures, in the `STAGES` order."""
+    results = []
+
+    def stage(name: str, function: Callable[[], Any]) -> Any:
+        result, seconds, peak = _measure(function, trace_memory=trace_memory)
+        results.append(StageResult(name, seconds, peak))
+        return result
+
+    raw = stage("load", lambda: parse_spec(spec_path.read_bytes(), spec_path.suffix))
+    spec = stage("validate", lambda: validate_spec(raw))
+    stage("schemas_by_name", spec.schemas_by_name)
+    stage("group_apis_by_tag", spec.group_apis_by_tag)
+    stage("render", lambda: ReferenceCodegen().generate({spec_path.parent.name: spec}, output))
+    return results
+
+
+def write_spec(shape: SpecShape, directory: PosixPath) -> PosixPath:
+    """Write a synthetic spec of the given shape as yaml under `directory`/v2 and return its path."""
+    path = directory / "v2" / "openapi.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.dump(synthetic_spec(shape), Dumper=yaml.CSafeDumper, sort_keys=False), encoding="utf-8")
+    return path
+
+
+def benchmark(shape: SpecShape, directory: PosixPath, *, repeat: int = 3) -> list[StageResult]:
+    """Return the best time and the peak memory of every stage for a spec of the given shape."""
+    spec_path = write_spec(shape, directory)
+    runs = [run_pipeline(spec_path, directory / f"output{i}") for i in range(repeat)]
+
+    tracemalloc.start()
+    try:
+        traced = run_pipeline(spec_path, directory / "output-traced", trace_memory=True)
+    finally:
+        tracemalloc.stop()
+
+    return [
+        StageResult(name, min(run[i].seconds for run in runs), traced[i].peak_bytes) for i, name in enumerate(STAGES)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=SpecShape.paths)
+    parser.add_argument("--schemas", type=int, default=SpecShape.schemas)
+    parser.add_argument("--one-of-depth", type=int, default=SpecShape.one_of_depth)
+    parser.add_argument("--ref-fan-out", type=int, default=SpecShape.ref_fan_out)
+    parser.add_argument("--tags", type=int, default=SpecShape.tags)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", type=pathlib.Path, help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    shape = SpecShape(
+        paths=args.paths,
+        schemas=args.schemas,
+        one_of_depth=args.one_of_depth,
+        ref_fan_out=args.ref_fan_out,
+        tags=args.tags,
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        results = benchmark(shape, pathlib.Path(directory), repeat=args.repeat)
+
+    print(f"{'stage':<20}{'time (s)':>12}{'peak (MiB)':>14}")  # noqa: T201
+    for result in results:
+        print(f"{result.stage:<20}{result.seconds:>12.3f}{result.peak_bytes / 2**20:>14.1f}")  # noqa: T201
+
+    if args.json is not None:
+        report = {"shape": asdict(shape), "stages": [asdict(result) for result in results]}
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+"""Compare spec validation with and without the preprocessing pass.
+
+python -m benchmarks.bench_validation [--paths N] [--schemas N] [--repeat N] [--min-speedup X]
+
+Exits with an error when preprocessing is not at least `--min-speedup` times faster.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import pickle
+import sys
+import time
+
+from benchmarks.synthetic import SpecShape, synthetic_spec
+from datadog_api_client_generator.openapi.loader import validate_spec
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=500)
+    parser.add_argument("--schemas", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-speedup", type=float, default=1.1)
+    args = parser.parse_args()
+
+    # Validation consumes the raw document, every run gets a fresh copy. Runs alternate between both modes so that
+    # load changes on the machine affect them alike, and are timed without garbage collection like `timeit` does.
+    data = pickle.dumps(synthetic_spec(SpecShape(paths=args.paths, schemas=args.schemas)))
+    timings = {False: [], True: []}
+    for _ in range(args.repeat):
+        for preprocess, runs in timings.items():
+            raw = pickle.loads(data)  # noqa: S301
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                validate_spec(raw, preprocess=preprocess)
+                runs.append(time.perf_counter() - start)
+            finally:
+                gc.enable()
+
+    results = {preprocess: min(runs) for preprocess, runs in timings.items()}
+    for preprocess, best in results.items():
+        print(f"preprocess={preprocess!s:<5} best of {args.repeat}: {best:.3f}s")  # noqa: T201
+
+    speedup = results[False] / results[True]
+    print(f"speedup: {speedup:.2f}x")  # noqa: T201
+    if speedup < args.min_speedup:
+        sys.exit(f"expected a speedup of at least {args.min_speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
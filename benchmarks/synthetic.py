@@ -0,0 +1,97 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+"""Generator of large synthetic specs, deterministic for a given shape."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SpecShape:
+    paths: int = 500
+    schemas: int = 1000
+    # Nesting of the oneOf property of every schema, 0 for none.
+    one_of_depth: int = 2
+    # Number of properties referencing other schemas in every schema.
+    ref_fan_out: int = 3
+    tags: int = 20
+
+
+def _ref(index: int, shape: SpecShape) -> dict:
+    return {"$ref": f"#/components/schemas/Model{index % shape.schemas}"}
+
+
+def _one_of(index: int, depth: int, shape: SpecShape) -> dict:
+    schema = {"type": "string", "enum": ["a", "b"], "x-enum-varnames": ["A", "B"]}
+    for level in range(depth):
+        schema = {"oneOf": [_ref(index + level + 1, shape), schema]}
+    return schema
+
+
+def _schema(index: int, shape: SpecShape) -> dict:
+    properties = {
+        "id": {"type": "string", "format": "uuid", "x-nullable": False},
+        "count": {"type": "integer", "format": "int64", "maximum": 100},
+        "created_at": {"type": "string", "format": "date-time"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "attributes": {"type": "object", "additionalProperties": {"type": "string"}},
+    }
+    for k in range(shape.ref_fan_out):
+        # A stride coprime with most sizes spreads references over the whole spec and creates cycles.
+        properties[f"related{k}"] = _ref(index * 7 + k + 1, shape)
+    if shape.one_of_depth:
+        properties["variant"] = _one_of(index, shape.one_of_depth, shape)
+
+    return {
+        "type": "object",
+        "description": f"Model {index}.",
+        "x-generate-alias-as-model": True,
+        "required": ["id"],
+        "properties": properties,
+    }
+
+
+def _path_item(index: int, shape: SpecShape) -> dict:
+    schema = _ref(index, shape)
+    tags = [f"Tag{index % shape.tags}"]
+    responses = {
+        "200": {"description": "OK", "content": {"application/json": {"schema": schema}}},
+        "404": {"description": "Not found", "content": {"application/json": {"schema": _ref(index + 1, shape)}}},
+    }
+    return {
+        "parameters": [{"in": "path", "name": "id", "required": True, "schema": {"type": "string"}}],
+        "get": {
+            "operationId": f"GetResource{index}",
+            "tags": tags,
+            "x-menu-order": index,
+            "parameters": [
+                {"in": "query", "name": "page", "schema": {"type": "integer", "format": "int64"}},
+                {"in": "query", "name": "filter", "schema": {"type": "array", "items": {"type": "string"}}},
+            ],
+            "responses": responses,
+        },
+        "put": {
+            "operationId": f"UpdateResource{index}",
+            "tags": tags,
+            "x-codegen-request-body-name": "body",
+            "requestBody": {"required": True, "content": {"application/json": {"schema": schema}}},
+            "responses": responses,
+        },
+    }
+
+
+def synthetic_spec(shape: SpecShape) -> dict:
+    """Return a raw document of the given shape.
+
+    Every path has two operations, every schema references `ref_fan_out` other schemas and has a oneOf property
+    nested `one_of_depth` times, and most nodes have extensions.
+    """
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic", "version": "1.0"},
+        "tags": [{"name": f"Tag{i}"} for i in range(shape.tags)],
+        "paths": {f"/api/v2/resource{i}/{{id}}": _path_item(i, shape) for i in range(shape.paths)},
+        "components": {"schemas": {f"Model{i}": _schema(i, shape) for i in range(shape.schemas)}},
+    }
@@ -1,45 +1,366 @@
 # Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
 #
 # This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import json
 import logging
 import pathlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
 import click
 
 from datadog_api_client_generator.codegen import GENERATORS
-from datadog_api_client_generator.openapi.openapi_model import OpenAPI
-from datadog_api_client_generator.openapi.utils import load_yaml
+from datadog_api_client_generator.codegen.shared.shard import Shard, ShardPlan, merge_shards, write_shard_metadata
+from datadog_api_client_generator.codegen.shared.templates_env import filter_cache_statistics
+from datadog_api_client_generator.openapi.cache import SpecCache
+from datadog_api_client_generator.openapi.diff import diff_specs
+from datadog_api_client_generator.openapi.fingerprint import intern_schemas
+from datadog_api_client_generator.openapi.loader import emit_normalized, load_spec, load_specs
+from datadog_api_client_generator.openapi.subset import Selection
+from datadog_api_client_generator.timings import Timings, stage
+from datadog_api_client_generator.watch import WatchSession
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import PosixPath
+
+    from datadog_api_client_generator.codegen.shared.base_codegen import BaseCodegen
 
 logger = logging.getLogger(__name__)
 _format = "%(asctime)s - %(levelname)s - %(message)s"
 logging.basicConfig(format=_format, level=logging.INFO)
 
-@click.command()
-@click.argument(
-    "specs",
-    nargs=-1,
-    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=pathlib.Path),
+
+class _DefaultGroup(click.Group):
+    """Group running the `generate` command when the first argument is not a command name.
+
+    Without arguments, or with only `--help`, the help of the group lists its commands.
+    """
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args != ["--help"] and args[0] not in self.commands:
+            args = ["generate", *args]
+        return super().parse_args(ctx, args)
+
+
+def _cache_options(function: Callable) -> Callable:
+    """Apply the options of the validated specs cache."""
+    options = [
+        click.option(
+            "--cache-dir",
+            type=click.Path(file_okay=False, path_type=pathlib.Path),
+            help="Directory of the validated specs cache. Defaults to the user cache directory.",
+        ),
+        click.option("--no-cache", is_flag=True, help="Do not read or write the validated specs cache."),
+    ]
+    for option in reversed(options):
+        function = option(function)
+    return function
+
+
+def _spec_options(function: Callable) -> Callable:
+    """Apply the arguments and options of the commands loading specs."""
+    options = [
+        click.argument(
+            "specs",
+            nargs=-1,
+            type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=pathlib.Path),
+            required=True,
+        ),
+        click.option(
+            "-j",
+            "--jobs",
+            type=click.IntRange(min=1),
+            default=1,
+            show_default=True,
+            help="Number of processes used to load and validate the specs.",
+        ),
+    ]
+    for option in reversed(options):
+        function = option(function)
+    return _cache_options(function)
+
+
+def _parse_shard(_ctx: click.Context, _param: click.Parameter, value: str | None) -> Shard | None:
+    if value is None:
+        return None
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+@click.group(cls=_DefaultGroup)
+def cli():
+    """Generate API clients from OpenAPI specs, with the `generate` command unless another command is named."""
+
+
+@cli.command("generate")
+@_spec_options
+@click.option(
+    "-g",
+    "--generator",
+    "generators",
+    type=click.Choice(list(GENERATORS.keys())),
+    multiple=True,
     required=True,
+    help="Generator to run. Repeatable, the specs are then loaded once for all generators.",
 )
 @click.option(
     "-o",
     "--output",
+    "outputs",
     type=click.Path(path_type=pathlib.Path),
+    multiple=True,
     required=True,
+    help="Output directory, given once per generator in the same order.",
 )
-@click.option("-g", "--generator", type=click.Choice(list(GENERATORS.keys())), required=True)
-def cli(*_args, **kwargs):
-    generator_cls = GENERATORS[kwargs.get("generator")]
-    generator = generator_cls()
-
-    output = kwargs.get("output")
-    specs = {}
-    for s in kwargs.get("specs"):
-        version = s.parent.name
-        spec = load_yaml(s)
-        spec = OpenAPI.model_validate(spec, context={})
-        specs[version] = spec
+@click.option(
+    "--concurrent",
+    is_flag=True,
+    help="Run the generators concurrently in threads, sharing the validated specs.",
+)
+@click.option(
+    "--emit-normalized",
+    type=click.Path(file_okay=False, path_type=pathlib.Path),
+    help="Write the specs in the normalized binary format, under a directory per version, for faster loading.",
+)
+@click.option(
+    "--templates-archive",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="Load templates precompiled in this archive, which is created first if missing and built again when the "
+    "templates or the generator changed. With several generators, the name of every generator is appended to the "
+    "archive name.",
+)
+@click.option(
+    "--intern-schemas",
+    is_flag=True,
+    help="Share the schemas identical between and within the specs, so that they are held and rendered once.",
+)
+@click.option(
+    "--freeze",
+    is_flag=True,
+    help="Convert the validated specs to their compact read-only representation before generating.",
+)
+@click.option(
+    "--timings",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="Write the wall time, CPU time and peak memory of every stage, and render times by template, to this JSON file.",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    help="Profile the run with cProfile and write the statistics to this file, readable with pstats.",
+)
+@click.option("--tag", "tags", multiple=True, help="Only generate the operations of this first tag. Repeatable.")
+@click.option("--operation-id", "operation_ids", multiple=True, help="Only generate this operation. Repeatable.")
+@click.option(
+    "--path-prefix",
+    "path_prefixes",
+    multiple=True,
+    help="Only generate the operations of paths starting with this prefix. Repeatable.",
+)
+@click.option(
+    "--shard",
+    callback=_parse_shard,
+    metavar="I/N",
+    help="Only generate the I-th of N shards of the operations, by tag, and of the schemas only they use. "
+    "Combine the outputs of every shard with the merge command.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="After generating, keep running and regenerate whenever a spec or a template changes. Not available with "
+    "several generators, --shard or --intern-schemas.",
+)
+@click.option(
+    "--poll-interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=0.5,
+    show_default=True,
+    help="Seconds between checks for changes in watch mode.",
+)
+def generate(**kwargs):
+    """Generate clients from specs."""
+    names, outputs = kwargs.get("generators"), kwargs.get("outputs")
+    if len(outputs) != len(names):
+        msg = "-o/--output must be given once per -g/--generator, in the same order"
+        raise click.UsageError(msg)
+    if len(set(outputs)) != len(outputs):
+        msg = "every generator needs its own output directory"
+        raise click.UsageError(msg)
+    if kwargs.get("watch") and len(names) > 1:
+        msg = "--watch supports a single generator"
+        raise click.UsageError(msg)
+    # Both are computed from all the specs at once, while watch mode loads changed specs again one by one.
+    if kwargs.get("watch") and kwargs.get("shard") is not None:
+        msg = "--watch cannot be combined with --shard"
+        raise click.UsageError(msg)
+    if kwargs.get("watch") and kwargs.get("intern_schemas"):
+        msg = "--watch cannot be combined with --intern-schemas"
+        raise click.UsageError(msg)
+
+    profiler = None
+    if kwargs.get("profile") is not None:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    timings = Timings() if kwargs.get("timings") is not None else None
+    selection = Selection(
+        tags=frozenset(kwargs.get("tags")),
+        operation_ids=frozenset(kwargs.get("operation_ids")),
+        path_prefixes=tuple(kwargs.get("path_prefixes")),
+    )
+
+    generators = []
+    for name, output in zip(names, outputs, strict=True):
+        generator_cls = GENERATORS[name]
+        templates_archive = kwargs.get("templates_archive")
+        if templates_archive is not None and len(names) > 1:
+            templates_archive = templates_archive.with_name(
+                f"{templates_archive.stem}-{name}{templates_archive.suffix}"
+            )
+        # Templates are only loaded from the archive once rendering, after it was compiled again if needed.
+        generator = generator_cls(templates_archive=templates_archive)
+        if templates_archive is not None and generator.templates_archive_stale(templates_archive):
+            with stage(timings, "precompile_templates", name):
+                generator.precompile_templates(templates_archive)
+        generator.timings = timings
+        # Operations matching any selector are generated, with the components they use, and other files are kept.
+        generator.partial = bool(selection)
+        generators.append((name, generator, output))
+
+    if kwargs.get("emit_normalized") is not None:
+        for s in kwargs.get("specs"):
+            logger.info("Wrote normalized spec %s", emit_normalized(s, kwargs.get("emit_normalized")))
+
+    cache = None if kwargs.get("no_cache") else SpecCache(kwargs.get("cache_dir"))
+    specs = load_specs(
+        kwargs.get("specs"), jobs=kwargs.get("jobs"), cache=cache, timings=timings, selection=selection or None
+    )
+    if kwargs.get("intern_schemas"):
+        with stage(timings, "intern"):
+            logger.info("Shared %d identical schemas", intern_schemas(specs.values()))
+    if kwargs.get("freeze"):
+        for version, spec in specs.items():
+            with stage(timings, "freeze", version):
+                specs[version] = spec.freeze()
+
+    shard = kwargs.get("shard")
+    if shard is not None:
+        shard_plan = ShardPlan(specs, shard.count)
+        for _, generator, _ in generators:
+            generator.shard = shard
+            generator.shard_plan = shard_plan
+
+    def run(name: str, generator: BaseCodegen, output: PosixPath) -> None:
+        with stage(timings, "generate", name):
+            generator.generate(specs=specs, output=output)
+        if shard is not None:
+            output.mkdir(parents=True, exist_ok=True)
+            write_shard_metadata(output, shard, generator.generator_id())
+            logger.info("Generated shard %s of %s", shard, name)
 
     logging.info("--------------------------------------------------------")
-    generator.generate(specs=specs, output=output)
+    if kwargs.get("concurrent") and len(generators) > 1:
+        # Values cached on first use are computed beforehand, so that generators only read the specs.
+        for spec in specs.values():
+            spec.warm_caches()
+        with ThreadPoolExecutor(max_workers=len(generators)) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, run, *target) for target in generators]
+            for future in futures:
+                future.result()
+    else:
+        for target in generators:
+            run(*target)
     logging.info("--------------------------------------------------------")
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(kwargs.get("profile"))
+        logger.info("Wrote profile %s", kwargs.get("profile"))
+    if timings is not None:
+        for timing in timings.stages:
+            logger.info("%s %s: %.3fs wall, %.3fs cpu", timing.stage, timing.version or "-", timing.wall, timing.cpu)
+        # Filter caches are shared by all environments.
+        timings.filters = filter_cache_statistics(generators[0][1].env)
+        for name, stats in timings.filters.items():
+            logger.info(
+                "filter %s: %d calls, %.1f%% cache hits", name, stats["hits"] + stats["misses"], stats["hit_rate"] * 100
+            )
+        timings.write(kwargs.get("timings"))
+        logger.info("Wrote timings %s", kwargs.get("timings"))
+
+    if kwargs.get("watch"):
+        _, generator, output = generators[0]
+        generator.timings = None
+
+        def load(path):
+            spec = load_spec(path, cache=cache, selection=selection or None)
+            return spec.freeze() if kwargs.get("freeze") else spec
+
+        WatchSession(generator, specs, kwargs.get("specs"), output, load=load).run(kwargs.get("poll_interval"))
+
+
+@cli.command("merge")
+@_spec_options
+@click.option("-g", "--generator", type=click.Choice(list(GENERATORS.keys())), required=True)
+@click.option("-o", "--output", type=click.Path(path_type=pathlib.Path), required=True)
+@click.option(
+    "-s",
+    "--shard-output",
+    "shard_outputs",
+    multiple=True,
+    required=True,
+    type=click.Path(exists=True, file_okay=False, path_type=pathlib.Path),
+    help="Output directory of a shard generated with --shard. Repeat for every shard of the run.",
+)
+def merge(**kwargs):
+    """Combine the outputs of every shard of a run and generate the files shared by shards."""
+    generator = GENERATORS[kwargs.get("generator")]()
+    cache = None if kwargs.get("no_cache") else SpecCache(kwargs.get("cache_dir"))
+    specs = load_specs(kwargs.get("specs"), jobs=kwargs.get("jobs"), cache=cache)
+
+    try:
+        result = merge_shards(generator, specs, kwargs.get("shard_outputs"), kwargs.get("output"))
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    logger.info(
+        "Merged %d shards: %d files written, %d unchanged, %d deleted",
+        len(kwargs.get("shard_outputs")),
+        len(result.written),
+        len(result.unchanged),
+        len(result.deleted),
+    )
+
+
+@cli.command("diff")
+@click.argument("old", type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path))
+@click.argument("new", type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path))
+@_cache_options
+@click.option("--json", "as_json", is_flag=True, help="Print the differences as JSON.")
+@click.option("--exit-code", is_flag=True, help="Exit with status 1 when the specs differ, like git diff.")
+def diff(**kwargs):
+    """Print the operations and models added (+), removed (-) and changed (~) from the OLD spec to the NEW one."""
+    start = time.perf_counter()
+    cache = None if kwargs.get("no_cache") else SpecCache(kwargs.get("cache_dir"))
+    result = diff_specs(load_spec(kwargs.get("old"), cache=cache), load_spec(kwargs.get("new"), cache=cache))
+
+    if kwargs.get("as_json"):
+        click.echo(json.dumps(result.to_dict(), indent=2))
+    else:
+        for section, changes in (("operations", result.operations), ("models", result.models)):
+            click.echo(
+                f"{section}: {len(changes.added)} added, {len(changes.removed)} removed, {len(changes.changed)} changed"
+            )
+            for marker, names in (("+", changes.added), ("-", changes.removed), ("~", changes.changed)):
+                for name in names:
+                    click.echo(f"  {marker} {name}")
+    logger.info("Compared specs in %.3fs", time.perf_counter() - start)
+
+    if kwargs.get("exit_code") and result:
+        raise SystemExit(1)
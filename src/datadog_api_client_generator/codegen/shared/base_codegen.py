@@ -3,18 +3,35 @@
 # This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
 from __future__ import annotations
 
+import functools
+import inspect
+import pathlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
-from datadog_api_client_generator.codegen.shared.templates_env import build_default_jinja2_env
+from datadog_api_client_generator.codegen.shared.manifest import Manifest, digest, model_digest
+from datadog_api_client_generator.codegen.shared.render import render_jobs
+from datadog_api_client_generator.codegen.shared.templates_env import (
+    archive_digest_path,
+    build_default_jinja2_env,
+    precompile_templates,
+    template_source,
+    templates_digest,
+)
+from datadog_api_client_generator.openapi.utils import package_version
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
     from pathlib import PosixPath
 
     from jinja2 import Environment
+    from pydantic import BaseModel
 
+    from datadog_api_client_generator.codegen.shared.render import RenderJob
+    from datadog_api_client_generator.codegen.shared.shard import Shard, ShardPlan
     from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+    from datadog_api_client_generator.timings import Timings
 
 
 @dataclass
@@ -23,17 +40,156 @@ class GeneratorConfig:
     additional_globals: dict[str, Any] | None = None
 
 
+def _generator_env(generator_cls: type[BaseCodegen], **kwargs: Any) -> Environment:
+    return generator_cls(**kwargs).env
+
+
 class BaseCodegen(ABC):
     generator_config: GeneratorConfig
 
-    def __init__(self) -> None:
-        """Initialize the generator environment."""
-        self.env: Environment = build_default_jinja2_env()
+    def __init__(self, *, templates_archive: PosixPath | None = None) -> None:
+        """Initialize the generator environment.
+
+        With `templates_archive`, templates are loaded from an archive created by `precompile_templates`.
+        """
+        self.templates_archive = templates_archive
+        self.env: Environment = self._build_env(templates_archive=templates_archive)
+
+        self.manifest: Manifest | None = None
+        # Render times by template are recorded here when set, see `on_rendered`.
+        self.timings: Timings | None = None
+        # Set when generating a subset of the operations, so that the files of the others are kept.
+        self.partial = False
+        # Set when generating one shard of a run, see `owns_tag` and `owns_schema`.
+        self.shard: Shard | None = None
+        self.shard_plan: ShardPlan | None = None
+        self._digests: dict[int, tuple[BaseModel, str]] = {}
+        self._template_digests: dict[str, str] = {}
+
+    def _build_env(self, **kwargs: Any) -> Environment:
+        env = build_default_jinja2_env(**kwargs)
 
         if self.generator_config.additional_filters:
-            self.env.filters.update(self.generator_config.additional_filters)
+            env.filters.update(self.generator_config.additional_filters)
         if self.generator_config.additional_globals:
-            self.env.globals.update(self.generator_config.additional_globals)
+            env.globals.update(self.generator_config.additional_globals)
+
+        return env
 
     @abstractmethod
     def generate(self, specs: list[OpenAPI], output: PosixPath): ...
+
+    def precompile_templates(self, target: PosixPath) -> None:
+        """Compile all the generator templates in an archive usable as `templates_archive`."""
+        env = self._build_env(use_bytecode_cache=False)
+        precompile_templates(env, target, templates_digest(env, self.generator_id()))
+
+    def templates_archive_stale(self, archive: PosixPath) -> bool:
+        """Return whether an archive is missing, or was compiled from other templates or another generator version."""
+        try:
+            recorded = archive_digest_path(archive).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return True
+        env = self._build_env(use_bytecode_cache=False)
+        return not archive.exists() or recorded != templates_digest(env, self.generator_id())
+
+    def owns_tag(self, version: str, tag: str | None) -> bool:
+        """Return whether the operations of a tag are generated by this run, always true unless sharded."""
+        return self.shard is None or self.shard_plan.tag_shard(version, tag) == self.shard.index
+
+    def owns_schema(self, version: str, name: str) -> bool:
+        """Return whether a schema is generated by this run, always true unless sharded.
+
+        Schemas shared between shards are generated by `generate_shared`.
+        """
+        return self.shard is None or self.shard_plan.schema_shard(version, name) == self.shard.index
+
+    def generate_shared(self, specs: dict[str, OpenAPI], output: PosixPath) -> None:
+        """Generate the files of a sharded run which belong to no shard, such as package indexes and shared schemas.
+
+        Called once when merging shards, with the combined shard outputs in `output`, `partial` and `shard_plan` set.
+        Generators ignoring `owns_tag` and `owns_schema` generate everything in every shard and have nothing to do.
+        """
+
+    def reload_templates(self) -> None:
+        """Rebuild the environment, so that changed templates are compiled again.
+
+        The templates archive is not used anymore, as it holds the previous templates.
+        """
+        self.templates_archive = None
+        self.env = self._build_env()
+        self._template_digests.clear()
+
+    def render(
+        self, jobs: Sequence[RenderJob], *, workers: int = 1, use_processes: bool = False, shared: Any = None
+    ) -> list[str]:
+        """Render jobs, in parallel when `workers` is greater than one, and return outputs in the jobs order.
+
+        See `render_jobs` for the `use_processes` and `shared` arguments.
+        """
+        return render_jobs(
+            jobs,
+            functools.partial(_generator_env, type(self), templates_archive=self.templates_archive),
+            workers=workers,
+            use_processes=use_processes,
+            shared=shared,
+            env=self.env,
+            on_rendered=self.on_rendered,
+        )
+
+    def on_rendered(self, job: RenderJob, seconds: float) -> None:
+        """Hook called after rendering every job of `render`, once per key, with its render time."""
+        if self.timings is not None:
+            self.timings.record_render(job.template, seconds)
+
+    def generator_id(self) -> str:
+        """Return an identifier of the generator code, used to invalidate manifests of other generators."""
+        source = pathlib.Path(inspect.getfile(type(self))).read_text(encoding="utf-8")
+        return f"{type(self).__qualname__}-{package_version()}-{digest(source)}"
+
+    def load_manifest(self, output: PosixPath) -> Manifest:
+        """Load the manifest of the previous run in `output`, used by `is_dirty`."""
+        self.manifest = Manifest.load(output, self.generator_id(), partial=self.partial)
+        self._digests.clear()
+        self._template_digests.clear()
+        return self.manifest
+
+    def is_dirty(self, path: str, inputs: str) -> bool:
+        """Return whether a file must be rendered. Without a loaded manifest, every file is rendered."""
+        if self.manifest is None:
+            return True
+        return self.manifest.is_dirty(path, inputs)
+
+    def inputs_digest(
+        self,
+        *,
+        templates: Iterable[str] = (),
+        nodes: Iterable[BaseModel] = (),
+        spec: OpenAPI | None = None,
+        schemas: Iterable[str] = (),
+    ) -> str:
+        """Return the digest of the inputs a generated file depends on.
+
+        `schemas` are component schema names of `spec` and include every schema they depend on, so changing a
+        schema dirties the files of all the schemas using it.
+        """
+        parts = [f"template:{name}:{self._template_digest(name)}" for name in templates]
+        parts.extend(f"node:{self._node_digest(node)}" for node in nodes)
+        if schemas:
+            components = spec.components.schemas
+            parts.extend(
+                f"schema:{name}:{self._node_digest(components[name])}"
+                for name in sorted(spec.schema_graph().closure(schemas))
+            )
+        return digest(*parts)
+
+    def _node_digest(self, node: BaseModel) -> str:
+        # Keep a reference on the node so that its id is not reused while cached.
+        if id(node) not in self._digests:
+            self._digests[id(node)] = (node, model_digest(node))
+        return self._digests[id(node)][1]
+
+    def _template_digest(self, name: str) -> str:
+        if name not in self._template_digests:
+            self._template_digests[name] = digest(template_source(self.env, name))
+        return self._template_digests[name]
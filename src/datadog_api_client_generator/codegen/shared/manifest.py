@@ -0,0 +1,84 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import PosixPath
+
+    from pydantic import BaseModel
+
+MANIFEST_FILENAME = ".generator-manifest.json"
+
+
+def digest(*parts: str) -> str:
+    """Return a stable digest of a sequence of strings."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def model_digest(node: BaseModel) -> str:
+    """Return a stable digest of a spec node.
+
+    References are hashed by their `$ref` value and not followed.
+    """
+    content = node.model_dump(exclude_unset=True, by_alias=True)
+    return digest(type(node).__name__, json.dumps(content, sort_keys=True, default=str))
+
+
+class Manifest:
+    """Record of the generated files and the digest of the inputs each one was rendered from.
+
+    The previous manifest is read from the output directory, and files whose inputs digest did not change since
+    can be skipped. A manifest written by a different generator is ignored. A `partial` run generates a subset of
+    the files: the other files of the previous run are kept and not reported stale.
+    """
+
+    def __init__(
+        self, output: PosixPath, generator: str, previous: dict[str, str] | None = None, *, partial: bool = False
+    ) -> None:
+        self.output = output
+        self.generator = generator
+        self.previous = previous or {}
+        self.partial = partial
+        self.files: dict[str, str] = {}
+
+    @classmethod
+    def load(cls, output: PosixPath, generator: str, *, partial: bool = False) -> Manifest:
+        """Return a manifest for the output directory, seeded with the previous run if any."""
+        try:
+            data = json.loads((output / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+
+        previous = data.get("files") if data.get("generator") == generator else None
+        return cls(output, generator, previous, partial=partial)
+
+    def is_dirty(self, path: str, inputs: str) -> bool:
+        """Record the inputs digest of a generated file and return whether it must be rendered again."""
+        self.files[path] = inputs
+        return self.previous.get(path) != inputs or not (self.output / path).exists()
+
+    def stale_files(self) -> list[str]:
+        """Return the files of the previous run that were not generated by this run."""
+        if self.partial:
+            return []
+        return sorted(self.previous.keys() - self.files.keys())
+
+    def dumps(self) -> str:
+        """Return the serialized manifest."""
+        files = {**self.previous, **self.files} if self.partial else self.files
+        data = {"generator": self.generator, "files": dict(sorted(files.items()))}
+        return json.dumps(data, indent=2) + "\n"
+
+    def save(self) -> None:
+        """Write the manifest in the output directory."""
+        self.output.mkdir(parents=True, exist_ok=True)
+        (self.output / MANIFEST_FILENAME).write_text(self.dumps(), encoding="utf-8")
@@ -0,0 +1,115 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import math
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from jinja2 import Environment
+
+_worker = threading.local()
+
+
+@dataclass
+class RenderJob:
+    template: str
+    output: str
+    context: dict[str, Any] = field(default_factory=dict)
+    # Jobs with the same template and key render the same content, which is rendered once. For instance the
+    # fingerprint of a schema, for outputs depending on nothing else.
+    key: str | None = None
+
+
+class RenderError(Exception):
+    """Raised once all jobs ran, with the failure of every job that could not be rendered."""
+
+    def __init__(self, failures: list[tuple[RenderJob, str]]) -> None:
+        self.failures = failures
+        details = "\n".join(f"{job.output} ({job.template}):\n{error}" for job, error in failures)
+        super().__init__(f"{len(failures)} file(s) failed to render:\n{details}")
+
+
+def _init_worker(env_factory: Callable[[], Environment]) -> None:
+    _worker.env = env_factory()
+
+
+def _render_one(job: RenderJob) -> tuple[str | None, str | None, float]:
+    start = time.perf_counter()
+    try:
+        return _worker.env.get_template(job.template).render(job.context), None, time.perf_counter() - start
+    except Exception:  # noqa: BLE001
+        return None, traceback.format_exc(), time.perf_counter() - start
+
+
+def _render_chunk(jobs: Sequence[RenderJob], _shared: Any) -> list[tuple[str | None, str | None, float]]:
+    # `_shared` is only there to be pickled together with the jobs, see `render_jobs`.
+    return [_render_one(job) for job in jobs]
+
+
+def render_jobs(
+    jobs: Sequence[RenderJob],
+    env_factory: Callable[[], Environment],
+    *,
+    workers: int = 1,
+    use_processes: bool = False,
+    shared: Any = None,
+    env: Environment | None = None,
+    on_rendered: Callable[[RenderJob, float], None] | None = None,
+) -> list[str]:
+    """Render jobs and return their outputs in the order of `jobs`.
+
+    Each worker renders with its own environment built by `env_factory`, `env` is used as is when rendering
+    serially. With `use_processes`, jobs are split in one chunk per worker and `env_factory` must be picklable.
+    Each chunk is pickled together with `shared`, typically the specs, so that spec nodes referenced from the jobs
+    context are restored with their references bound.
+
+    All jobs are rendered before failures are reported together in a `RenderError`. `on_rendered` is called in
+    the calling thread with every rendered job and its render time in seconds.
+    """
+    # Jobs sharing a template and a key are rendered once, `positions` maps every job to the job rendered for it.
+    rendered: list[RenderJob] = []
+    positions = []
+    first: dict[tuple[str, str], int] = {}
+    for job in jobs:
+        if job.key is not None and (job.template, job.key) in first:
+            positions.append(first[job.template, job.key])
+            continue
+        if job.key is not None:
+            first[job.template, job.key] = len(rendered)
+        positions.append(len(rendered))
+        rendered.append(job)
+    jobs = rendered
+
+    if workers <= 1 or len(jobs) <= 1:
+        _worker.env = env or env_factory()
+        results = [_render_one(job) for job in jobs]
+    elif use_processes:
+        size = math.ceil(len(jobs) / workers)
+        chunks = [jobs[i : i + size] for i in range(0, len(jobs), size)]
+        with ProcessPoolExecutor(
+            max_workers=len(chunks), initializer=_init_worker, initargs=(env_factory,)
+        ) as executor:
+            futures = [executor.submit(_render_chunk, chunk, shared) for chunk in chunks]
+            results = [result for future in futures for result in future.result()]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(env_factory,)) as executor:
+            results = list(executor.map(_render_one, jobs))
+
+    if on_rendered is not None:
+        for job, (_, _, seconds) in zip(jobs, results, strict=True):
+            on_rendered(job, seconds)
+
+    failures = [(job, error) for job, (_, error, _) in zip(jobs, results, strict=True) if error is not None]
+    if failures:
+        raise RenderError(failures)
+
+    return [results[position][0] for position in positions]
@@ -0,0 +1,181 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import tempfile
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from datadog_api_client_generator.codegen.shared.manifest import MANIFEST_FILENAME, Manifest
+from datadog_api_client_generator.codegen.shared.writer import OutputWriter
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import PosixPath
+
+    from datadog_api_client_generator.codegen.shared.base_codegen import BaseCodegen
+    from datadog_api_client_generator.codegen.shared.writer import CommitResult
+    from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+
+SHARD_FILENAME = ".generator-shard.json"
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of `count` shards, `index` starting at 0."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> Shard:
+        """Parse a `i/N` shard, `i` starting at 1."""
+        number, _, count = value.partition("/")
+        try:
+            shard = cls(int(number) - 1, int(count))
+        except ValueError:
+            shard = None
+        if shard is None or not 0 <= shard.index < shard.count:
+            msg = f"invalid shard {value!r}, expected i/N with 1 <= i <= N"
+            raise ValueError(msg)
+        return shard
+
+    def __str__(self) -> str:
+        return f"{self.index + 1}/{self.count}"
+
+
+class ShardPlan:
+    """Assignment of the operations, by tag, and of the schemas of specs to `count` shards.
+
+    Tags are assigned heaviest first to the least loaded shard, weighted by the number of their operations and of the
+    schemas they use, so that every machine computes the same plan from the same specs. A schema used by the
+    operations of a single shard belongs to it, other schemas are shared and generated once when merging.
+    """
+
+    def __init__(self, specs: dict[str, OpenAPI], count: int) -> None:
+        self.count = count
+        self.tags: dict[tuple[str, str | None], int] = {}
+        self.schemas: dict[tuple[str, str], int | None] = {}
+
+        weights = {}
+        used_by: dict[tuple[str, str | None], list[str]] = {}
+        for version in sorted(specs):
+            for tag, operations in specs[version].group_apis_by_tag().items():
+                schemas = {}
+                for _, _, operation in operations:
+                    operation.schemas_by_name(schemas)
+                used_by[version, tag] = list(schemas)
+                weights[version, tag] = len(operations) + len(schemas)
+
+        loads = [0] * count
+        for key in sorted(weights, key=lambda key: (-weights[key], key[0], key[1] or "")):
+            shard = min(range(count), key=lambda i: (loads[i], i))
+            self.tags[key] = shard
+            loads[shard] += weights[key]
+
+        shards: dict[tuple[str, str], set[int]] = {}
+        for (version, tag), names in used_by.items():
+            for name in names:
+                shards.setdefault((version, name), set()).add(self.tags[version, tag])
+        for version, spec in specs.items():
+            for name in (spec.components and spec.components.schemas) or {}:
+                owners = shards.get((version, name), set())
+                self.schemas[version, name] = next(iter(owners)) if len(owners) == 1 else None
+
+    def tag_shard(self, version: str, tag: str | None) -> int:
+        """Return the shard generating the operations of a tag."""
+        return self.tags[version, tag]
+
+    def schema_shard(self, version: str, name: str) -> int | None:
+        """Return the shard generating a schema, None for shared schemas."""
+        return self.schemas.get((version, name))
+
+    def shared_schemas(self, version: str) -> list[str]:
+        """Return the schemas of a version used by several shards, or by none."""
+        return [name for (v, name), shard in self.schemas.items() if v == version and shard is None]
+
+
+def write_shard_metadata(output: PosixPath, shard: Shard, generator: str) -> None:
+    """Record in a shard output which shard it is, for `merge_shards`."""
+    data = {"generator": generator, "index": shard.index, "count": shard.count}
+    (output / SHARD_FILENAME).write_text(json.dumps(data) + "\n", encoding="utf-8")
+
+
+def _read_shard_metadata(directories: Sequence[PosixPath], generator: str) -> int:
+    shards = []
+    for directory in directories:
+        try:
+            shards.append(json.loads((directory / SHARD_FILENAME).read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            msg = f"{directory} is not the output of a shard, generated with --shard"
+            raise ValueError(msg) from None
+    count = shards[0]["count"] if shards else 0
+    if any(shard["generator"] != generator for shard in shards):
+        msg = "shards were generated by another generator or generator version"
+        raise ValueError(msg)
+    if sorted(shard["index"] for shard in shards) != list(range(count)) or any(s["count"] != count for s in shards):
+        found = ", ".join(str(Shard(shard["index"], shard["count"])) for shard in shards)
+        msg = f"expected every shard of one run exactly once, got {found}"
+        raise ValueError(msg)
+    return count
+
+
+def _read_tree(directory: PosixPath) -> dict[str, bytes]:
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = pathlib.Path(root) / name
+            files[path.relative_to(directory).as_posix()] = path.read_bytes()
+    return files
+
+
+def merge_shards(
+    generator: BaseCodegen, specs: dict[str, OpenAPI], directories: Sequence[PosixPath], output: PosixPath
+) -> CommitResult:
+    """Combine the outputs of every shard of a run, generate the shared files, and commit the result to `output`.
+
+    Files generated by several shards must be identical. Shard manifests are merged, the shared files are generated
+    by `BaseCodegen.generate_shared` in a staging directory, and the whole result is committed at once, so that
+    unchanged files of `output` are left untouched and files of the previous run not generated anymore are deleted.
+    """
+    generator_id = generator.generator_id()
+    count = _read_shard_metadata(directories, generator_id)
+
+    files: dict[str, bytes] = {}
+    entries: dict[str, str] = {}
+    for directory in directories:
+        for path, content in _read_tree(directory).items():
+            if path == MANIFEST_FILENAME:
+                entries.update(json.loads(content).get("files", {}))
+            elif path != SHARD_FILENAME:
+                if files.get(path, content) != content:
+                    msg = f"{path} differs between shards"
+                    raise ValueError(msg)
+                files[path] = content
+
+    with tempfile.TemporaryDirectory() as directory:
+        staging = pathlib.Path(directory)
+        writer = OutputWriter(staging, manifest=Manifest(staging, generator_id, entries), atomic=False)
+        for path, content in files.items():
+            writer.write(path, content)
+        writer.manifest.files = dict(entries)
+        writer.commit()
+
+        generator.shard = None
+        generator.shard_plan = ShardPlan(specs, count)
+        generator.partial = True
+        generator.generate_shared(specs, staging)
+        files = _read_tree(staging)
+
+    # Files without inputs digest are recorded too, so that they are deleted from `output` once not generated.
+    manifest = Manifest.load(output, generator_id)
+    manifest.files = {path: "" for path in files if path != MANIFEST_FILENAME}
+    manifest.files.update(json.loads(files.pop(MANIFEST_FILENAME)).get("files", {}))
+    writer = OutputWriter(output, manifest=manifest)
+    for path, content in files.items():
+        writer.write(path, content)
+    return writer.commit()
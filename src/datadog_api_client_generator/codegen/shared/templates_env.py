@@ -4,11 +4,19 @@
 from __future__ import annotations
 
 import pathlib
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from jinja2 import Environment, FileSystemLoader
+import jinja2
+from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader, TemplateNotFound
 
-from datadog_api_client_generator.codegen.shared.utils import camel_case, snake_case
+from datadog_api_client_generator.codegen.shared.manifest import digest
+from datadog_api_client_generator.codegen.shared.utils import cache_statistics, camel_case, snake_case
+from datadog_api_client_generator.openapi.cache import user_cache_dir
+
+if TYPE_CHECKING:
+    from pathlib import PosixPath
+
+TEMPLATES_DIR = pathlib.Path(__file__).parent.parent / "python/templates"
 
 
 def default_filters() -> dict[str, Any]:
@@ -18,14 +26,96 @@ def default_filters() -> dict[str, Any]:
     }
 
 
+def filter_cache_statistics(env: Environment) -> dict[str, dict[str, Any]]:
+    """Return the cache statistics of the memoized filters of the environment, in this process."""
+    return {name: stats for name, function in env.filters.items() if (stats := cache_statistics(function)) is not None}
+
+
 def default_globals() -> dict[str, Any]:
     return {"enumerate": enumerate}
 
 
-def build_default_jinja2_env() -> Environment:
-    templates_dir = str(pathlib.Path(__file__).parent.parent / "python/templates")
-    env = Environment(loader=FileSystemLoader(templates_dir))
+def default_bytecode_cache_dir() -> pathlib.Path:
+    """Return the user cache directory of compiled templates for the installed Jinja2 version."""
+    return user_cache_dir() / f"jinja2-{jinja2.__version__}"
+
+
+def build_default_jinja2_env(
+    *,
+    bytecode_cache_dir: PosixPath | None = None,
+    use_bytecode_cache: bool = True,
+    templates_archive: PosixPath | None = None,
+) -> Environment:
+    """Return the shared templates environment.
+
+    Compiled templates are cached on disk, keyed by template source checksum, so that only templates changed since
+    the previous run are compiled. With `templates_archive`, templates are loaded from an archive created by
+    `precompile_templates`, falling back to the templates directory for templates missing from it.
+    """
+    loader = FileSystemLoader(str(TEMPLATES_DIR))
+    if templates_archive is not None:
+        loader = ChoiceLoader([ModuleLoader(str(templates_archive)), loader])
+
+    bytecode_cache = None
+    if use_bytecode_cache:
+        directory = bytecode_cache_dir or default_bytecode_cache_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(directory))
+
+    env = Environment(loader=loader, bytecode_cache=bytecode_cache)
     env.filters.update(default_filters())
     env.globals.update(default_globals())
 
     return env
+
+
+def template_directories(env: Environment) -> list[pathlib.Path]:
+    """Return the directories templates of the environment are loaded from."""
+    directories = []
+    loaders = [env.loader]
+    while loaders:
+        loader = loaders.pop(0)
+        if isinstance(loader, ChoiceLoader):
+            loaders[:0] = loader.loaders
+        elif isinstance(loader, FileSystemLoader):
+            directories.extend(pathlib.Path(path) for path in loader.searchpath)
+    return directories
+
+
+def template_source(env: Environment, name: str) -> str:
+    """Return the source of a template, from the loaders of the environment other than templates archives.
+
+    Archives only hold compiled templates, their `get_source` raises instead of returning the source.
+    """
+    loaders = [env.loader]
+    while loaders:
+        loader = loaders.pop(0)
+        if isinstance(loader, ChoiceLoader):
+            loaders[:0] = loader.loaders
+        elif loader is not None and not isinstance(loader, ModuleLoader):
+            try:
+                return loader.get_source(env, name)[0]
+            except TemplateNotFound:
+                continue
+    raise TemplateNotFound(name)
+
+
+def templates_digest(env: Environment, *parts: str) -> str:
+    """Return a digest of the sources of all templates of the environment, and of `parts`."""
+    return digest(*parts, *(f"{name}:{template_source(env, name)}" for name in sorted(env.list_templates())))
+
+
+def archive_digest_path(archive: PosixPath) -> PosixPath:
+    """Return the file recording the digest of the templates an archive was compiled from."""
+    return archive.with_name(f"{archive.name}.digest")
+
+
+def precompile_templates(env: Environment, target: PosixPath, sources_digest: str | None = None) -> None:
+    """Compile all templates of the environment in a zip archive loadable with `templates_archive`.
+
+    `sources_digest` is recorded next to the archive, see `archive_digest_path`.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    env.compile_templates(str(target), zip="deflated", ignore_errors=False)
+    if sources_digest is not None:
+        archive_digest_path(target).write_text(sources_digest + "\n", encoding="utf-8")
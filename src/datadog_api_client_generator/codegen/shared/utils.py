@@ -1,21 +1,44 @@
 # Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
 #
 # This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import functools
 import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Runs of separators, and word boundaries: before a capitalized word, or between a lowercase letter or digit and an
+# uppercase letter.
+PATTERN_WORD_BOUNDARY = re.compile(r"[\W_]+|(?<=[^\W_])(?=[A-Z][a-z])|(?<=[a-z0-9])(?=[A-Z])")
+
+# Names are converted for every property, parameter and model of every template, with few distinct values.
+NAMING_CACHE_SIZE = 16384
+
+
+def naming_filter(function: Callable[[str], str]) -> Callable[[str], str]:
+    """Memoize a name conversion in a bounded cache, whose statistics are returned by `cache_info`."""
+    return functools.lru_cache(maxsize=NAMING_CACHE_SIZE)(function)
+
 
-PATTERN_WHITESPACE = re.compile(r"\W")
-PATTERN_LEADING_ALPHA = re.compile(r"(.)([A-Z][a-z]+)")
-PATTERN_FOLLOWING_ALPHA = re.compile(r"([a-z0-9])([A-Z])")
-PATTERN_DOUBLE_UNDERSCORE = re.compile(r"__+")
+def cache_statistics(function: Any) -> dict[str, Any] | None:
+    """Return the hits, misses, size and hit rate of a filter memoized with `naming_filter`, None for other filters."""
+    cache_info = getattr(function, "cache_info", None)
+    if cache_info is None:
+        return None
+    info = cache_info()
+    calls = info.hits + info.misses
+    return {**info._asdict(), "hit_rate": info.hits / calls if calls else 0.0}
 
 
+@naming_filter
 def snake_case(value: str) -> str:
-    value = PATTERN_LEADING_ALPHA.sub(r"\1_\2", value)
-    value = PATTERN_FOLLOWING_ALPHA.sub(r"\1_\2", value).lower()
-    value = PATTERN_WHITESPACE.sub("_", value)
-    value = value.rstrip("_")
-    return PATTERN_DOUBLE_UNDERSCORE.sub("_", value)
+    return PATTERN_WORD_BOUNDARY.sub("_", value).lower().rstrip("_")
 
 
+@naming_filter
 def camel_case(value: str) -> str:
-    return "".join(x.title() for x in snake_case(value).split("_"))
+    # Underscores are word boundaries for `title`.
+    return snake_case(value).title().replace("_", "")
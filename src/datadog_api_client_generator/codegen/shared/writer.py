@@ -0,0 +1,151 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import os
+import pathlib
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from datadog_api_client_generator.codegen.shared.manifest import MANIFEST_FILENAME
+
+if TYPE_CHECKING:
+    from pathlib import PosixPath
+
+    from datadog_api_client_generator.codegen.shared.manifest import Manifest
+
+
+@dataclass
+class CommitResult:
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+
+
+# The umask can only be read by changing it, which is done once at import instead of while threads write files.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _link_tree(source: PosixPath, target: PosixPath) -> None:
+    # Hard links keep the inode and modification time of unchanged files. Symbolic links, which `os.walk` does not
+    # follow, are created again with the same target.
+    for root, dirs, files in os.walk(source):
+        relative = pathlib.Path(root).relative_to(source)
+        for name in (*dirs, *files):
+            path = pathlib.Path(root) / name
+            if path.is_symlink():
+                os.symlink(os.readlink(path), target / relative / name)
+            elif name in dirs:
+                (target / relative / name).mkdir()
+            else:
+                try:
+                    os.link(path, target / relative / name)
+                except OSError:
+                    shutil.copy2(path, target / relative / name)
+
+
+def _remove_empty_parents(path: PosixPath, root: PosixPath) -> None:
+    parent = path.parent
+    while parent != root and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+class OutputWriter:
+    """Buffer generated files and commit them to the output directory at once.
+
+    Files whose content did not change are not written, so their modification time is preserved, and files listed
+    in the previous manifest but not generated anymore are deleted. Every file is replaced atomically, and the
+    manifest last, so that an interrupted commit is redone by the next run. When `atomic`, changes are applied to a
+    copy of the output directory made of hard links, which then replaces the output directory with two renames, at
+    the cost of linking every file of the output: readers see the previous or the new files, never a mix of both,
+    but the output directory is missing between the two renames.
+    """
+
+    def __init__(self, output: PosixPath, *, manifest: Manifest | None = None, atomic: bool = False) -> None:
+        self.output = output
+        self.manifest = manifest
+        self.atomic = atomic
+        self.files: dict[str, bytes] = {}
+
+    def write(self, path: str, content: str | bytes) -> None:
+        """Buffer the content of a file, `path` being relative to the output directory."""
+        self.files[path] = content.encode() if isinstance(content, str) else content
+
+    def commit(self) -> CommitResult:
+        """Write changed files and delete stale ones."""
+        if self.manifest is not None:
+            self.write(MANIFEST_FILENAME, self.manifest.dumps())
+
+        result = CommitResult()
+        changed = {}
+        for path, content in sorted(self.files.items()):
+            target = self.output / path
+            if target.is_file() and target.read_bytes() == content:
+                result.unchanged.append(path)
+            else:
+                changed[path] = content
+                result.written.append(path)
+
+        if self.manifest is not None:
+            result.deleted = [
+                path
+                for path in self.manifest.stale_files()
+                if path not in self.files and (self.output / path).is_file()
+            ]
+
+        if changed or result.deleted:
+            if self.atomic:
+                self._commit_atomic(changed, result.deleted)
+            else:
+                self._apply(self.output, changed, result.deleted)
+
+        self.files.clear()
+        return result
+
+    @staticmethod
+    def _apply(directory: PosixPath, changed: dict[str, bytes], deleted: list[str]) -> None:
+        for path, content in sorted(changed.items(), key=lambda item: item[0] == MANIFEST_FILENAME):
+            target = directory / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            mode = target.stat().st_mode if target.exists() else 0o666 & ~_UMASK
+            # Never write in place: the target may be a hard link to the current output.
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(content)
+            pathlib.Path(tmp).chmod(mode)
+            pathlib.Path(tmp).replace(target)
+
+        for path in deleted:
+            target = directory / path
+            target.unlink(missing_ok=True)
+            _remove_empty_parents(target, directory)
+
+    def _commit_atomic(self, changed: dict[str, bytes], deleted: list[str]) -> None:
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        staging = pathlib.Path(tempfile.mkdtemp(dir=self.output.parent, prefix=f".{self.output.name}."))
+        try:
+            if self.output.exists():
+                _link_tree(self.output, staging)
+            self._apply(staging, changed, deleted)
+            # The output is moved aside before the copy takes its place, the mode of the directory is kept.
+            if self.output.exists():
+                staging.chmod(self.output.stat().st_mode)
+                backup = staging.with_name(f"{staging.name}.old")
+                self.output.rename(backup)
+                try:
+                    staging.rename(self.output)
+                except BaseException:
+                    backup.rename(self.output)
+                    raise
+                shutil.rmtree(backup)
+            else:
+                staging.chmod(0o777 & ~_UMASK)
+                staging.rename(self.output)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
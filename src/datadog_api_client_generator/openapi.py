@@ -4,14 +4,15 @@
 import pathlib
 
 import yaml
-from jsonref import JsonRef
 from yaml import CSafeLoader
 
+from datadog_api_client_generator.openapi.utils import resolve_refs
+
 
 def load(filename):
     path = pathlib.Path(filename)
     with path.open() as fp:
-        return JsonRef.replace_refs(yaml.load(fp, Loader=CSafeLoader))
+        return resolve_refs(yaml.load(fp, Loader=CSafeLoader))
 
 
 def apis(spec):
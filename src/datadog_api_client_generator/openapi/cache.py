@@ -0,0 +1,114 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from typing import TYPE_CHECKING
+
+import pydantic
+
+from datadog_api_client_generator.openapi.utils import package_version
+
+if TYPE_CHECKING:
+    from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+CACHE_SUFFIX = ".pickle"
+
+
+def user_cache_dir() -> pathlib.Path:
+    """Return the user cache directory of the generator."""
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base) / "datadog-api-client-generator"
+
+
+def default_cache_dir() -> pathlib.Path:
+    """Return the user cache directory used for validated specs."""
+    return user_cache_dir() / "specs"
+
+
+def _generator_version() -> str:
+    # Pickled models depend on the model definitions, which can change without a version bump during development.
+    digest = hashlib.sha256()
+    for module in sorted(pathlib.Path(__file__).parent.glob("*.py")):
+        digest.update(module.read_bytes())
+
+    return f"{package_version()}-{pydantic.VERSION}-{digest.hexdigest()}"
+
+
+class SpecCache:
+    """On-disk cache of validated `OpenAPI` models keyed by spec content.
+
+    Entries are evicted least recently used first once the cache exceeds `max_size` bytes.
+    """
+
+    def __init__(self, directory: pathlib.Path | None = None, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+        self.version = _generator_version()
+
+    def key(self, data: bytes, variant: str = "") -> str:
+        """Return the cache key of the raw spec content, and of the `variant` of the model built from it if any."""
+        digest = hashlib.sha256(self.version.encode())
+        if variant:
+            digest.update(variant.encode() + b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> OpenAPI | None:
+        """Return the cached model or None on cache miss."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            spec = pickle.loads(data)  # noqa: S301
+        except Exception:  # noqa: BLE001
+            # Corrupted or incompatible entry, drop it.
+            path.unlink(missing_ok=True)
+            return None
+
+        # Refresh the modification time used for least recently used eviction.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return spec
+
+    def put(self, key: str, spec: OpenAPI) -> None:
+        """Store the model and evict old entries if needed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                pickle.dump(spec, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            pathlib.Path(tmp).replace(self._path(key))
+        except BaseException:
+            pathlib.Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in `max_size`."""
+        entries = []
+        for path in self.directory.glob(f"*{CACHE_SUFFIX}"):
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
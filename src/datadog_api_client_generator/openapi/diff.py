@@ -0,0 +1,96 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+"""Semantic difference between two versions of a document, from the fingerprints of their nodes."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from datadog_api_client_generator.openapi.fingerprint import SchemaFingerprints
+    from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+
+
+@dataclass
+class Changes:
+    """Names added, removed and changed between two documents, sorted."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+
+    @classmethod
+    def compare(cls, old: dict[str, str], new: dict[str, str]) -> Changes:
+        """Compare two mappings of names to fingerprints."""
+        return cls(
+            added=sorted(new.keys() - old.keys()),
+            removed=sorted(old.keys() - new.keys()),
+            changed=sorted(name for name in old.keys() & new.keys() if old[name] != new[name]),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass
+class SpecDiff:
+    """Operations and models added, removed or changed between two documents.
+
+    Operations are named by operationId, or by method and path without one, and models by component name. A change
+    of a schema changes the models and operations using it, directly or through references.
+    """
+
+    operations: Changes
+    models: Changes
+
+    def __bool__(self) -> bool:
+        return bool(self.operations or self.models)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            section: {"added": changes.added, "removed": changes.removed, "changed": changes.changed}
+            for section, changes in (("operations", self.operations), ("models", self.models))
+        }
+
+
+def _operation_fingerprints(
+    spec: OpenAPI, fingerprints: SchemaFingerprints, paths: set[str] | None = None
+) -> dict[str, str]:
+    operations = {}
+    for path, item in spec.paths.items():
+        if paths is not None and path not in paths:
+            continue
+        # Parameters of the path item are parameters of its operations.
+        shared = [fingerprints.node(parameter) for parameter in item.parameters or ()]
+        for method, operation in item.operations():
+            name = operation.operationId or f"{method.upper()} {path}"
+            operations[name] = fingerprints.node(operation) + "".join(shared)
+    return operations
+
+
+def diff_specs(old: OpenAPI, new: OpenAPI) -> SpecDiff:
+    """Return the operations and models added, removed or changed from `old` to `new`.
+
+    Path items are compared first, and operations are only compared for the paths added, removed or changed.
+    """
+    old_fingerprints, new_fingerprints = old.schema_fingerprints(), new.schema_fingerprints()
+
+    old_paths = {path: old_fingerprints.node(item) for path, item in old.paths.items()}
+    new_paths = {path: new_fingerprints.node(item) for path, item in new.paths.items()}
+    paths = Changes.compare(old_paths, new_paths)
+    differing = {*paths.added, *paths.removed, *paths.changed}
+
+    old_schemas = (old.components and old.components.schemas) or {}
+    new_schemas = (new.components and new.components.schemas) or {}
+    return SpecDiff(
+        operations=Changes.compare(
+            _operation_fingerprints(old, old_fingerprints, differing),
+            _operation_fingerprints(new, new_fingerprints, differing),
+        ),
+        models=Changes.compare(
+            {name: old_fingerprints.component(name) for name in old_schemas},
+            {name: new_fingerprints.component(name) for name in new_schemas},
+        ),
+    )
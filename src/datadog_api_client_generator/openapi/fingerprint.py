@@ -0,0 +1,182 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+"""Structural fingerprints of schemas, and sharing of identical schemas between and within documents.
+
+The fingerprint of a schema is a hash of its type, its values and the fingerprints of its child schemas. A reference
+is hashed with its target name and the fingerprint of its target, so two schemas with the same fingerprint are
+interchangeable even when they come from different documents. Component schemas are fingerprinted after the schemas they depend on,
+and the schemas of a reference cycle are hashed together.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
+
+from datadog_api_client_generator.openapi.schema_model import Schema, SchemaRef
+from datadog_api_client_generator.openapi.shared_model import RefObject, _Base, node_fields
+from datadog_api_client_generator.openapi.utils import Empty
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+    from datadog_api_client_generator.openapi.schema_model import SchemaType
+
+
+def _hash(*parts: Any) -> str:
+    content = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def _is_schema(value: Any) -> bool:
+    return isinstance(value, (Schema, SchemaRef))
+
+
+def _encode(value: Any, fingerprints: dict[int, str]) -> Any:
+    if _is_schema(value):
+        return ["schema", fingerprints[id(value)]]
+    if isinstance(value, list):
+        return ["list", [_encode(item, fingerprints) for item in value]]
+    if isinstance(value, dict):
+        return ["map", [[key, _encode(item, fingerprints)] for key, item in value.items()]]
+    return value
+
+
+class SchemaFingerprints:
+    """Fingerprints of the schemas of a document, computed at once and looked up by node or component name.
+
+    Nodes are kept referenced so that their id is not reused while the fingerprints are.
+    """
+
+    def __init__(self, spec: OpenAPI) -> None:
+        self._fingerprints: dict[int, str] = {}
+        self._nodes: list[Any] = []
+        self._components: dict[str, str] = {}
+        self._others: dict[int, str] = {}
+
+        graph = spec.schema_graph()
+        schemas = (spec.components and spec.components.schemas) or {}
+        for component in graph.strongly_connected_components():
+            members = sorted(name for name in component if name in schemas)
+            if not any(graph.is_cyclic(name) for name in members):
+                for name in members:
+                    self._components[name] = self._fingerprint(schemas[name])
+                continue
+
+            # References within the cycle are hashed by name first. The schemas using them are then hashed again
+            # with the hash of the whole cycle, which depends on the content of all its schemas.
+            tainted: dict[int, Any] = {}
+            local = {name: self._fingerprint(schemas[name], frozenset(members), tainted) for name in members}
+            cycle_hash = _hash("cycle", sorted(local.items()))
+            for node_id in tainted:
+                self._fingerprints[node_id] = _hash(cycle_hash, self._fingerprints[node_id])
+            for name in members:
+                self._components[name] = self._fingerprints[id(schemas[name])]
+
+        # Schemas of the paths, parameters and responses.
+        stack = [spec]
+        while stack:
+            value = stack.pop()
+            if _is_schema(value):
+                self._fingerprint(value)
+            elif isinstance(value, _Base):
+                stack.extend(child for name, child in node_fields(value) if name != "extensions")
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+
+    def _fingerprint(
+        self, root: SchemaType, cycle: frozenset[str] = frozenset(), tainted: dict[int, Any] | None = None
+    ) -> str:
+        # Post-order walk with an explicit stack, children are fingerprinted before their parent. Schemas using a
+        # reference to a schema of `cycle` are recorded in `tainted`.
+        if tainted is None:
+            tainted = {}
+        stack = [(root, None)]
+        while stack:
+            node, children = stack.pop()
+            if id(node) in self._fingerprints:
+                continue
+            if isinstance(node, SchemaRef):
+                if node.name in cycle:
+                    fingerprint = _hash("ref", node.ref, "cycle", node.extensions)
+                    tainted[id(node)] = node
+                else:
+                    fingerprint = _hash("ref", node.ref, self._components.get(node.name), node.extensions)
+            elif children is None:
+                children = node.child_schemas()
+                stack.append((node, children))
+                stack.extend((child, None) for child in children)
+                continue
+            else:
+                if any(id(child) in tainted for child in children):
+                    tainted[id(node)] = node
+                fields = sorted(
+                    (name, _encode(value, self._fingerprints))
+                    for name, value in node_fields(node)
+                    if not isinstance(value, Empty)
+                )
+                fingerprint = _hash(type(node).__name__, fields)
+            self._fingerprints[id(node)] = fingerprint
+            self._nodes.append(node)
+        return self._fingerprints[id(root)]
+
+    def node(self, value: Any) -> str:
+        """Return the fingerprint of any node of the document, such as a path item or an operation.
+
+        Nodes are hashed like schemas, with the fingerprints of the schemas they use, and references to parameters
+        or responses with the fingerprint of their target.
+        """
+        if _is_schema(value):
+            return self._fingerprints.get(id(value)) or self._fingerprint(value)
+        fingerprint = self._others.get(id(value))
+        if fingerprint is None:
+            if isinstance(value, RefObject):
+                target = value()
+                fingerprint = _hash("ref", value.ref, None if target is None else self.node(target))
+            else:
+                fields = sorted(
+                    (name, self._encode_node(item)) for name, item in node_fields(value) if not isinstance(item, Empty)
+                )
+                fingerprint = _hash(type(value).__name__, fields)
+            self._others[id(value)] = fingerprint
+            self._nodes.append(value)
+        return fingerprint
+
+    def _encode_node(self, value: Any) -> Any:
+        if isinstance(value, _Base):
+            return ["node", self.node(value)]
+        if isinstance(value, list):
+            return ["list", [self._encode_node(item) for item in value]]
+        if isinstance(value, dict):
+            return ["map", [[key, self._encode_node(item)] for key, item in value.items()]]
+        return value
+
+    def __getitem__(self, node: SchemaType) -> str:
+        """Return the fingerprint of a schema of the document."""
+        return self._fingerprints[id(node)]
+
+    def get(self, node: Any) -> str | None:
+        return self._fingerprints.get(id(node))
+
+    def component(self, name: str) -> str:
+        """Return the fingerprint of a component schema."""
+        return self._components[name]
+
+
+def intern_schemas(specs: Iterable[OpenAPI]) -> int:
+    """Share identical schemas between and within documents, and return the number of schemas replaced.
+
+    Every schema is replaced by the first schema seen with the same fingerprint, so that identical sub-trees are
+    held in memory once, and generators can render identical schemas once. References are bound again and the
+    cached indexes of the documents are dropped. Documents must not be frozen.
+    """
+    table: dict[str, Any] = {}
+    replaced = 0
+    for spec in specs:
+        replaced += spec.intern_schemas(table)
+    return replaced
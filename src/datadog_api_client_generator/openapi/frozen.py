@@ -0,0 +1,214 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+"""Compact read-only representation of validated spec nodes.
+
+`freeze` converts a validated tree into instances of slotted classes mirroring the models. Frozen nodes keep the
+attributes, the methods and `__call__` of their model, report the model as their `__class__` so that `isinstance`
+checks keep working, and cannot be assigned public attributes. Private attributes stay settable as they hold caches.
+"""
+
+from __future__ import annotations
+
+import types
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from datadog_api_client_generator.openapi.shared_model import _Base
+from datadog_api_client_generator.openapi.utils import Empty
+
+T = TypeVar("T")
+
+# Model methods which are copied to frozen classes, in addition to the non dunder ones.
+_COPIED_DUNDERS = frozenset(("__call__", "__getstate__", "__setstate__"))
+_FROZEN_CLASSES: dict[type[_Base], type[FrozenNode]] = {}
+_EMPTY = Empty()
+
+
+def _read_only(*_args: object, **_kwargs: object) -> None:
+    msg = "frozen mapping cannot be modified"
+    raise TypeError(msg)
+
+
+class _ReadOnlyDict(dict):
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> tuple:
+        return _ReadOnlyDict, (dict(self),)
+
+
+# Shared by all the frozen nodes without extensions.
+EMPTY_EXTENSIONS = _ReadOnlyDict()
+
+
+class FrozenNode:
+    """Base class of the frozen counterparts of the spec models."""
+
+    __slots__ = ("model_fields_set",)
+    __thawed__: type[_Base]
+    __frozen_slots__: frozenset[str] = frozenset()
+    model_fields: dict[str, Any] = {}
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if not name.startswith("_"):
+            msg = f"cannot assign {name!r}, {type(self).__name__} is frozen"
+            raise AttributeError(msg)
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        msg = f"cannot delete {name!r}, {type(self).__name__} is frozen"
+        raise AttributeError(msg)
+
+    def __reduce__(self) -> tuple:
+        return _new_frozen, (self.__thawed__,), self.__getstate__()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Same layout as pydantic models, so that the `__getstate__` and `__setstate__` of the models work as is.
+        return {
+            "__dict__": {name: getattr(self, name) for name in self.model_fields},
+            "__pydantic_fields_set__": set(self.model_fields_set),
+            "__pydantic_extra__": None,
+            "__pydantic_private__": {name: getattr(self, name) for name in self.__thawed__.__private_attributes__},
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in (*state["__dict__"].items(), *state["__pydantic_private__"].items()):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "model_fields_set", frozenset(state["__pydantic_fields_set__"]))
+
+    def __repr__(self) -> str:
+        return f"<frozen {type(self).__name__} at {id(self):#x}>"
+
+    def model_dump(self, *, exclude_unset: bool = False, by_alias: bool = False) -> dict[str, Any]:
+        """Return the fields as a dictionary, like `BaseModel.model_dump`."""
+        return {
+            (info.alias or name) if by_alias else name: _dump(
+                getattr(self, name), exclude_unset=exclude_unset, by_alias=by_alias
+            )
+            for name, info in self.model_fields.items()
+            if not exclude_unset or name in self.model_fields_set
+        }
+
+
+def _dump(value: Any, *, exclude_unset: bool, by_alias: bool) -> Any:
+    if isinstance(value, FrozenNode):
+        return value.model_dump(exclude_unset=exclude_unset, by_alias=by_alias)
+    if isinstance(value, dict):
+        return {k: _dump(v, exclude_unset=exclude_unset, by_alias=by_alias) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_dump(v, exclude_unset=exclude_unset, by_alias=by_alias) for v in value]
+    return value
+
+
+def _new_frozen(cls: type[_Base]) -> FrozenNode:
+    return object.__new__(frozen_class(cls))
+
+
+def _copy_function(func: types.FunctionType, class_cell: types.CellType) -> types.FunctionType:
+    # Zero argument `super()` looks the class up in the `__class__` cell, which must be the frozen class.
+    closure = func.__closure__
+    if "__class__" in func.__code__.co_freevars:
+        closure = tuple(
+            class_cell if name == "__class__" else cell
+            for name, cell in zip(func.__code__.co_freevars, closure, strict=True)
+        )
+    copy = types.FunctionType(func.__code__, func.__globals__, func.__name__, func.__defaults__, closure)
+    copy.__kwdefaults__ = func.__kwdefaults__
+    copy.__qualname__ = func.__qualname__
+    copy.__doc__ = func.__doc__
+    copy.__dict__.update(func.__dict__)
+    return copy
+
+
+def frozen_class(cls: type[_Base]) -> type[FrozenNode]:
+    """Return the frozen class of a model class, creating it on first use."""
+    if cls in _FROZEN_CLASSES:
+        return _FROZEN_CLASSES[cls]
+
+    bases = tuple(frozen_class(base) for base in cls.__bases__ if issubclass(base, _Base)) or (FrozenNode,)
+    inherited = frozenset().union(*(base.__frozen_slots__ for base in bases))
+    slots = [name for name in (*cls.model_fields, *cls.__private_attributes__) if name not in inherited]
+
+    class_cell = types.CellType()
+    namespace = {
+        "__slots__": tuple(slots),
+        "__module__": __name__,
+        "__qualname__": cls.__qualname__,
+        "__thawed__": cls,
+        "__frozen_slots__": inherited.union(slots),
+        "__class__": property(lambda _self: cls),
+        "model_fields": cls.model_fields,
+    }
+    for name, value in vars(cls).items():
+        if isinstance(value, types.FunctionType) and (not name.startswith("__") or name in _COPIED_DUNDERS):
+            namespace[name] = _copy_function(value, class_cell)
+
+    frozen = type(cls.__name__, bases, namespace)
+    class_cell.cell_contents = frozen
+    _FROZEN_CLASSES[cls] = frozen
+    return frozen
+
+
+class _Freezer:
+    def __init__(self) -> None:
+        self.memo: dict[int, FrozenNode] = {}
+        self.interned: dict[Any, Any] = {}
+        self.pending: list[tuple[_Base, FrozenNode]] = []
+
+    def intern(self, value: T) -> T:
+        return self.interned.setdefault(value, value)
+
+    def node(self, node: _Base) -> FrozenNode:
+        if id(node) not in self.memo:
+            self.memo[id(node)] = _new_frozen(type(node))
+            self.pending.append((node, self.memo[id(node)]))
+        return self.memo[id(node)]
+
+    def value(self, value: Any) -> Any:
+        # Containers are only as deep as the literal values of the spec, nodes are queued instead of walked.
+        if isinstance(value, FrozenNode):
+            return value
+        if isinstance(value, BaseModel):
+            return self.node(value)
+        if isinstance(value, Empty):
+            return _EMPTY
+        if isinstance(value, str):
+            return self.intern(value)
+        if isinstance(value, dict):
+            return {self.intern(k) if isinstance(k, str) else k: self.value(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.value(v) for v in value)
+        return value
+
+    def fill(self, node: _Base, frozen: FrozenNode) -> None:
+        for name in type(node).model_fields:
+            value = getattr(node, name)
+            if name == "extensions" and not value:
+                object.__setattr__(frozen, name, EMPTY_EXTENSIONS)
+            else:
+                object.__setattr__(frozen, name, self.value(value))
+        object.__setattr__(frozen, "model_fields_set", self.intern(frozenset(node.model_fields_set)))
+
+        # Private attributes are caches: those holding nodes are carried over, other ones (document indexes, context
+        # variables) are reset and rebuilt on demand from the frozen tree.
+        for name, attribute in type(node).__private_attributes__.items():
+            value = getattr(node, name)
+            if value is not None and not isinstance(value, (BaseModel, FrozenNode, dict, list, tuple)):
+                value = attribute.get_default()
+            object.__setattr__(frozen, name, self.value(value))
+
+    def freeze(self, root: T) -> T:
+        frozen = self.value(root)
+        while self.pending:
+            self.fill(*self.pending.pop())
+        return frozen
+
+
+def freeze(node: T) -> T:
+    """Return a frozen copy of a validated node and all the nodes reachable from it.
+
+    Equal strings, such as types, formats and property names, are shared, and so are the empty extensions and
+    omitted values. The tree is walked iteratively and references are kept bound to the frozen targets.
+    """
+    return _Freezer().freeze(node)
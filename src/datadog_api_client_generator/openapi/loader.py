@@ -0,0 +1,225 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import functools
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+from datadog_api_client_generator.openapi.operation_model import PathsItemObject, ResponseType
+from datadog_api_client_generator.openapi.parameter_model import ParameterType
+from datadog_api_client_generator.openapi.preprocess import preprocess_spec, preprocessed_validator
+from datadog_api_client_generator.openapi.schema_model import SchemaType
+from datadog_api_client_generator.openapi.shared_model import SecuritySchemeType
+from datadog_api_client_generator.openapi.subset import Selection, select_operations
+from datadog_api_client_generator.openapi.utils import NORMALIZED_SUFFIX, dump_normalized, parse_spec
+from datadog_api_client_generator.timings import StageTiming, Timings, stage
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import PosixPath
+
+    from pydantic_core import SchemaValidator
+
+    from datadog_api_client_generator.openapi.cache import SpecCache
+
+
+_COMPONENT_TYPES = {
+    "schemas": SchemaType,
+    "parameters": ParameterType,
+    "responses": ResponseType,
+    "securitySchemes": SecuritySchemeType,
+}
+_PATHS_ITEM_ADAPTER = TypeAdapter(PathsItemObject)
+_COMPONENT_ADAPTERS = {section: TypeAdapter(type_) for section, type_ in _COMPONENT_TYPES.items()}
+
+
+@functools.cache
+def _preprocessed_validators() -> tuple[SchemaValidator, dict[str, SchemaValidator], SchemaValidator]:
+    # Validators of the paths items, the components and the document prepared by `preprocess_spec`, built on first
+    # use as building them takes longer than the adapters.
+    components = {section: preprocessed_validator(type_) for section, type_ in _COMPONENT_TYPES.items()}
+    return preprocessed_validator(PathsItemObject), components, preprocessed_validator(OpenAPI)
+
+
+def _validate_section(
+    adapter: TypeAdapter | SchemaValidator, value: Any, loc: tuple[str, ...], context: dict[str, Any]
+) -> Any:
+    try:
+        return adapter.validate_python(value, context=context)
+    except ValidationError as e:
+        errors = [{**error, "loc": (*loc, *error["loc"])} for error in e.errors(include_url=False)]
+        raise ValidationError.from_exception_data(OpenAPI.__name__, errors) from None
+
+
+def _validate_mapping(
+    raw: dict[str, Any], adapter: TypeAdapter | SchemaValidator, loc: tuple[str, ...], context: dict[str, Any]
+) -> dict[str, Any]:
+    validated = {}
+    for key in list(raw):
+        validated[key] = _validate_section(adapter, raw.pop(key), (*loc, key), context)
+    return validated
+
+
+def validate_spec(raw: dict[str, Any], *, preprocess: bool = True) -> OpenAPI:
+    """Return the validated openapi specification of a parsed document, one path and one component at a time.
+
+    Each raw path and component is removed from `raw` as soon as it is validated, so the raw document and its models
+    are never both fully held in memory. With `preprocess`, the raw nodes are prepared in a single pass beforehand
+    and validated without the model validators preparing them.
+    """
+    context = {"openapi": ContextVar(str(id(raw)))}
+    paths_item, components_adapters, document = _PATHS_ITEM_ADAPTER, _COMPONENT_ADAPTERS, None
+    if preprocess:
+        preprocess_spec(raw)
+        paths_item, components_adapters, document = _preprocessed_validators()
+
+    if isinstance(raw.get("paths"), dict):
+        raw["paths"] = _validate_mapping(raw["paths"], paths_item, ("paths",), context)
+
+    components = raw.get("components")
+    if isinstance(components, dict):
+        for section, adapter in components_adapters.items():
+            if isinstance(components.get(section), dict):
+                if section == "schemas" and not preprocess:
+                    for name, schema in components["schemas"].items():
+                        if isinstance(schema, dict):
+                            schema["name"] = name
+                components[section] = _validate_mapping(components[section], adapter, ("components", section), context)
+
+    if document is not None:
+        return document.validate_python(raw, context=context)
+    return OpenAPI.model_validate(raw, context=context)
+
+
+def load_spec(
+    path: PosixPath,
+    cache: SpecCache | None = None,
+    timings: Timings | None = None,
+    selection: Selection | None = None,
+) -> OpenAPI:
+    """Return validated openapi specification from a yaml, json or normalized spec file.
+
+    When a cache is given, the validated model is looked up by the spec content hash and stored on cache miss.
+    Stages are recorded in `timings` under the version of the spec. With a `selection`, the document is restricted
+    to the selected operations and the components they use before validation, see `select_operations`.
+    """
+    variant = selection.key() if selection else ""
+    version = path.parent.name
+    with stage(timings, "read", version):
+        data = path.read_bytes()
+
+    key = None
+    if cache is not None:
+        with stage(timings, "cache_lookup", version):
+            key = cache.key(data, variant)
+            spec = cache.get(key)
+        if spec is not None:
+            return spec
+    return _build_spec(path, data, key, cache=cache, timings=timings, selection=selection)
+
+
+def _build_spec(
+    path: PosixPath,
+    data: bytes,
+    key: str | None,
+    cache: SpecCache | None = None,
+    timings: Timings | None = None,
+    selection: Selection | None = None,
+) -> OpenAPI:
+    # Build the model of a spec missing from the cache under `key`, and store it.
+    version = path.parent.name
+    with stage(timings, "parse", version):
+        raw = parse_spec(data, path.suffix)
+    if selection:
+        with stage(timings, "select", version):
+            select_operations(raw, selection)
+    with stage(timings, "validate", version):
+        spec = validate_spec(raw)
+
+    if cache is not None:
+        with stage(timings, "cache_store", version):
+            cache.put(key, spec)
+    return spec
+
+
+def emit_normalized(path: PosixPath, directory: PosixPath) -> PosixPath:
+    """Write the normalized binary form of a spec file in `directory`/<version> and return its path.
+
+    Normalized specs load much faster than yaml and can be passed instead of the original spec.
+    """
+    target = directory / path.parent.name / f"{path.stem}{NORMALIZED_SUFFIX}"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(dump_normalized(parse_spec(path.read_bytes(), path.suffix)))
+    return target
+
+
+def _load_spec_pickled(
+    path: PosixPath,
+    data: bytes,
+    key: str | None,
+    cache: SpecCache | None = None,
+    *,
+    selection: Selection | None = None,
+    timed: bool = False,
+) -> tuple[bytes, list[StageTiming]]:
+    # Results are unpickled by the executor in a helper thread, where the document ContextVar would be set in the
+    # wrong context. Unpickle in the calling thread instead.
+    timings = Timings() if timed else None
+    spec = _build_spec(path, data, key, cache=cache, timings=timings, selection=selection)
+    with stage(timings, "pickle", path.parent.name):
+        pickled = pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL)
+    return pickled, timings.stages if timings is not None else []
+
+
+def load_specs(
+    paths: Sequence[PosixPath],
+    jobs: int = 1,
+    cache: SpecCache | None = None,
+    timings: Timings | None = None,
+    selection: Selection | None = None,
+) -> dict[str, OpenAPI]:
+    """Return validated openapi specifications keyed by version.
+
+    The version is the name of the directory containing the spec file. When `jobs` is greater than one,
+    specs missing from the cache are parsed and validated in a process pool and the resulting models are pickled back.
+    Stages are recorded in `timings`, including the ones run in the process pool. See `load_spec` for `selection`.
+    """
+    variant = selection.key() if selection else ""
+    loaded = {}
+    pending = []
+    for path in paths:
+        key = None
+        if cache is None:
+            with stage(timings, "read", path.parent.name):
+                data = path.read_bytes()
+        else:
+            with stage(timings, "cache_lookup", path.parent.name):
+                data = path.read_bytes()
+                key = cache.key(data, variant)
+                spec = cache.get(key)
+            if spec is not None:
+                loaded[path] = spec
+                continue
+        # The content and the key of pending specs are passed on, so that they are read and hashed once.
+        pending.append((path, data, key))
+
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+            load = functools.partial(_load_spec_pickled, cache=cache, selection=selection, timed=timings is not None)
+            for (path, _, _), (data, stages) in zip(pending, executor.map(load, *zip(*pending)), strict=True):
+                if timings is not None:
+                    timings.extend(stages)
+                with stage(timings, "unpickle", path.parent.name):
+                    loaded[path] = pickle.loads(data)  # noqa: S301
+    else:
+        for path, data, key in pending:
+            loaded[path] = _build_spec(path, data, key, cache=cache, timings=timings, selection=selection)
+
+    return {path.parent.name: loaded[path] for path in paths}
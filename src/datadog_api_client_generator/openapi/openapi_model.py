@@ -4,15 +4,31 @@
 from __future__ import annotations
 
 from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
 
 from pydantic import ValidationInfo, model_validator
 
-from datadog_api_client_generator.openapi.operation_model import OperationObject, PathsItemObject, ResponseType
+from datadog_api_client_generator.openapi import frozen
+from datadog_api_client_generator.openapi.fingerprint import SchemaFingerprints
+from datadog_api_client_generator.openapi.operation_index import Operation, OperationIndex
+from datadog_api_client_generator.openapi.operation_model import PathsItemObject, ResponseType
 from datadog_api_client_generator.openapi.parameter_model import ParameterType
+from datadog_api_client_generator.openapi.schema_graph import SchemaGraph
 from datadog_api_client_generator.openapi.schema_model import SchemaType
-from datadog_api_client_generator.openapi.shared_model import ExternalDocs, SecuritySchemeType, Server, _Base
+from datadog_api_client_generator.openapi.shared_model import (
+    ExternalDocs,
+    RefObject,
+    SecuritySchemeType,
+    Server,
+    _Base,
+    iter_schemas,
+    prepares_raw,
+)
 from datadog_api_client_generator.openapi.utils import Empty, OptionalEmpty
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 class OpenAPIContact(_Base):
     name: OptionalEmpty[str] = Empty()
@@ -34,10 +50,12 @@ class Components(_Base):
     securitySchemes: OptionalEmpty[dict[str, SecuritySchemeType]] = {}
 
     @model_validator(mode="before")
-    def _inject_schema_names(cls, v: dict, _info: ValidationInfo) -> dict:  # noqa: N805
+    @prepares_raw
+    def _inject_schema_names(cls, v: dict) -> dict:  # noqa: N805
         if "schemas" in v:
             for k, schema in v["schemas"].items():
-                schema["name"] = k
+                if isinstance(schema, dict):
+                    schema["name"] = k
         return v
 
 
@@ -46,6 +64,10 @@ class Tag(_Base):
     description: OptionalEmpty[str] = Empty()
 
 
+# Indexes derived from the document, some keyed by node ids, which are rebuilt on demand rather than pickled.
+_DERIVED_CACHES = ("_schema_graph", "_operation_index", "_tags_by_name", "_schema_fingerprints")
+
+
 class OpenAPI(_Base):
     openapi: str
     info: OpenAPIInfo
@@ -55,33 +77,191 @@ class OpenAPI(_Base):
     tags: OptionalEmpty[list[Tag]] = None
     externalDocs: OptionalEmpty[ExternalDocs] = Empty()
     security: OptionalEmpty[list[dict[str, list[str]]]] = Empty()
+    _root_openapi: ContextVar[OpenAPI] | None = None
+    _ref_index: dict[str, Any] = {}
+    _schema_graph: SchemaGraph | None = None
+    _operation_index: OperationIndex | None = None
+    _tags_by_name: dict[str, Tag] | None = None
+    _schema_fingerprints: SchemaFingerprints | None = None
 
     @model_validator(mode="before")
     def _inject_ctx(cls, v: dict, info: ValidationInfo) -> dict:  # noqa: N805
         if info.context is None:
             msg = "context cannot be None when initializing"
             raise AttributeError(msg)
-        info.context["openapi"] = ContextVar(str(id(v)))
+        # The variable may already exist when sections of the document were validated beforehand.
+        info.context.setdefault("openapi", ContextVar(str(id(v))))
         return v
 
     @model_validator(mode="after")
     def _inject_ctx_after(self, info: ValidationInfo) -> dict:
-        info.context["openapi"].set(self)
+        self._root_openapi = info.context["openapi"]
+        self._root_openapi.set(self)
+        self._bind_refs()
         return self
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self.invalidate_caches()
+
+    def invalidate_caches(self) -> None:
+        """Drop the indexes derived from the document.
+
+        Assigning a field does it automatically, it must be called after mutating a field in place.
+        """
+        self._schema_graph = None
+        self._operation_index = None
+        self._tags_by_name = None
+        self._schema_fingerprints = None
+        for path in self.paths.values():
+            for _, operation in path.operations():
+                operation.invalidate_caches()
+
+    def _warm_operation_caches(self) -> None:
+        for path in self.paths.values():
+            for _, operation in path.operations():
+                operation.get_parameters()
+                operation.get_accept_headers()
+                operation.get_return_schema()
+
+    def warm_caches(self) -> None:
+        """Compute the indexes and operation values cached on first use.
+
+        Generators sharing the document in threads then only read it.
+        """
+        self._warm_operation_caches()
+        self.operation_index()
+        self.schema_graph()
+        self.tags_by_name()
+
+    def schema_fingerprints(self) -> SchemaFingerprints:
+        """Return the structural fingerprints of the document schemas, computed on first use."""
+        if self._schema_fingerprints is None:
+            self._schema_fingerprints = SchemaFingerprints(self)
+        return self._schema_fingerprints
+
+    def intern_schemas(self, table: dict[str, Any]) -> int:
+        """Replace every schema by the schema with the same fingerprint in `table`, and return the number replaced.
+
+        Schemas missing from `table` are added to it, see `fingerprint.intern_schemas`.
+        """
+        if not hasattr(self, "__dict__"):
+            msg = "frozen documents cannot be interned"
+            raise TypeError(msg)
+
+        fingerprints = self.schema_fingerprints()
+        replaced = 0
+        visited = set()
+        stack: list[_Base] = [self]
+
+        def canonical(value: Any) -> Any:
+            nonlocal replaced
+            fingerprint = fingerprints.get(value)
+            shared = value if fingerprint is None else table.setdefault(fingerprint, value)
+            if shared is not value:
+                replaced += 1
+            elif isinstance(value, _Base) and id(value) not in visited:
+                visited.add(id(value))
+                stack.append(value)
+            return shared
+
+        while stack:
+            node = stack.pop()
+            for name, value in list(node.__dict__.items()):
+                if name == "extensions":
+                    continue
+                if isinstance(value, _Base):
+                    if (shared := canonical(value)) is not value:
+                        setattr(node, name, shared)
+                elif isinstance(value, list):
+                    value[:] = [canonical(item) for item in value]
+                elif isinstance(value, dict):
+                    for key, item in value.items():
+                        value[key] = canonical(item)
+
+        self._bind_refs()
+        self.invalidate_caches()
+        return replaced
+
+    def freeze(self) -> OpenAPI:
+        """Return a compact read-only copy of the document, see `frozen.freeze`.
+
+        The values cached by the operations are computed first, as frozen nodes cannot be validated into new models.
+        """
+        self._warm_operation_caches()
+        return frozen.freeze(self)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Context variables cannot be pickled, the document sets a new one when unpickled.
+        state = super().__getstate__()
+        state["__pydantic_private__"] = {
+            **state["__pydantic_private__"],
+            **dict.fromkeys(_DERIVED_CACHES),
+            "_root_openapi": None,
+        }
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        super().__setstate__(state)
+        self._root_openapi = ContextVar(str(id(self)))
+        self._root_openapi.set(self)
+        self._bind_refs(self._root_openapi)
+
+    def _bind_refs(self, root_openapi: ContextVar[OpenAPI] | None = None) -> None:
+        self._ref_index = {}
+        if self.components:
+            for section in Components.model_fields.keys() - {"extensions"}:
+                for name, component in (getattr(self.components, section) or {}).items():
+                    self._ref_index[f"#/components/{section}/{name}"] = component
+
+        unresolved = set()
+        for node in self.iter_nodes():
+            if isinstance(node, RefObject) and node.bind(self._ref_index, root_openapi) is None:
+                unresolved.add(node.ref)
+
+        if unresolved:
+            msg = f"unresolved references: {', '.join(sorted(unresolved))}"
+            raise ValueError(msg)
+
+    def resolve_ref(self, ref: str) -> Any:
+        """Return the component referenced by a local `$ref` value."""
+        return self._ref_index[ref]
+
     def tags_by_name(self) -> dict[str, Tag]:
-        return {tag.name: tag for tag in self.tags}
+        if self._tags_by_name is None:
+            self._tags_by_name = {tag.name: tag for tag in self.tags or ()}
+        return self._tags_by_name
 
-    def group_apis_by_tag(self) -> dict[str, list[str, str, OperationObject]]:
-        operations = {}
+    def operation_index(self) -> OperationIndex:
+        """Return the index of the document operations, built on first use."""
+        if self._operation_index is None:
+            self._operation_index = OperationIndex(self.paths)
+        return self._operation_index
 
-        for path in self.paths:
-            for k, v in self.paths[path]:
-                if isinstance(v, OperationObject):
-                    tag = v.tags[0] if v.tags else None
-                    operations.setdefault(tag, []).append((path, k, v))
+    def get_operation(self, operation_id: str) -> Operation | None:
+        """Return the `(path, method, operation)` with the given operationId."""
+        return self.operation_index().get(operation_id)
 
-        return operations
+    def group_apis_by_tag(self) -> dict[str, list[Operation]]:
+        """Return the operations grouped by their first tag, a copy which callers may modify."""
+        return {tag: list(operations) for tag, operations in self.operation_index().by_tag.items()}
+
+    def schema_graph(self) -> SchemaGraph:
+        """Return the dependency graph of the component schemas, built on first use."""
+        if self._schema_graph is None:
+            self._schema_graph = SchemaGraph.from_schemas((self.components and self.components.schemas) or {})
+        return self._schema_graph
+
+    def iter_schemas(self, *, recursive: bool = True, include_self: bool = True) -> Iterator[SchemaType]:
+        """Return the named schemas used by the operations of the document, each name once."""
+        roots = [
+            schema
+            for path in self.paths.values()
+            for _, operation in path.operations()
+            for schema in operation.root_schemas()
+        ]
+        return iter_schemas(roots, recursive=recursive, include_self=include_self)
 
     def schemas_by_name(
         self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
@@ -89,7 +269,7 @@ class OpenAPI(_Base):
         if mapping is None:
             mapping = {}
 
-        for path in self.paths.values():
-            mapping.update(path.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
+        for schema in self.iter_schemas(recursive=recursive, include_self=include_self):
+            mapping.setdefault(schema.name, schema)
 
         return mapping
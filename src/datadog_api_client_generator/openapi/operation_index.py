@@ -0,0 +1,52 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, TypeAlias
+
+if TYPE_CHECKING:
+    from datadog_api_client_generator.openapi.operation_model import OperationObject, PathsItemObject
+
+Operation: TypeAlias = "tuple[str, str, OperationObject]"
+
+
+class OperationIndex:
+    """Lookups of the operations of a document.
+
+    Operations are `(path, method, operation)` tuples, returned in document order.
+    """
+
+    def __init__(self, paths: dict[str, PathsItemObject]) -> None:
+        self.operations: list[Operation] = [
+            (path, method, operation) for path, item in paths.items() for method, operation in item.operations()
+        ]
+        self._position = {id(operation): i for i, (_, _, operation) in enumerate(self.operations)}
+
+        self.by_tag: dict[str | None, list[Operation]] = {}
+        self.by_method: dict[str, list[Operation]] = {}
+        self.by_operation_id: dict[str, Operation] = {}
+        self._by_path: dict[str, list[Operation]] = {}
+        for entry in self.operations:
+            path, method, operation = entry
+            self.by_tag.setdefault(operation.tags[0] if operation.tags else None, []).append(entry)
+            self.by_method.setdefault(method, []).append(entry)
+            self._by_path.setdefault(path, []).append(entry)
+            if operation.operationId:
+                self.by_operation_id.setdefault(operation.operationId, entry)
+        self._sorted_paths = sorted(self._by_path)
+
+    def get(self, operation_id: str) -> Operation | None:
+        """Return the operation with the given operationId."""
+        return self.by_operation_id.get(operation_id)
+
+    def by_path_prefix(self, prefix: str) -> list[Operation]:
+        """Return the operations whose path starts with `prefix`."""
+        start = bisect.bisect_left(self._sorted_paths, prefix)
+        entries = []
+        for path in self._sorted_paths[start:]:
+            if not path.startswith(prefix):
+                break
+            entries.extend(self._by_path[path])
+        return sorted(entries, key=lambda entry: self._position[id(entry[2])])
@@ -3,13 +3,20 @@
 # This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
 from __future__ import annotations
 
-from typing import Any, Iterator, TypeAlias
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from pydantic import Field
 
 from datadog_api_client_generator.openapi.parameter_model import Parameter, ParameterType
 from datadog_api_client_generator.openapi.schema_model import SchemaType
-from datadog_api_client_generator.openapi.shared_model import ExternalDocs, RefObject, Server, _Base
+from datadog_api_client_generator.openapi.shared_model import ExternalDocs, RefObject, Server, _Base, iter_schemas
 from datadog_api_client_generator.openapi.utils import HEADER_ANY_TYPE, Empty, OptionalEmpty, StrBool
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
 
 class MediaObject(_Base):
     schema: OptionalEmpty[SchemaType] = Empty()
@@ -23,7 +30,7 @@ class RequestBody(_Base):
 
 
 class ResponseObject(_Base):
-    content: OptionalEmpty[dict[str, MediaObject]] = {}
+    content: OptionalEmpty[dict[str, MediaObject]] = Field(default_factory=dict)
     description: OptionalEmpty[str] = None
 
 
@@ -39,11 +46,24 @@ class OperationObject(_Base):
     deprecated: OptionalEmpty[StrBool] = Empty()
     externalDocs: OptionalEmpty[ExternalDocs] = Empty()
     requestBody: OptionalEmpty[RequestBody] = Empty()
-    responses: OptionalEmpty[dict[str, ResponseType]] = {}
-    servers: OptionalEmpty[list[Server]] = []
+    responses: OptionalEmpty[dict[str, ResponseType]] = Field(default_factory=dict)
+    servers: OptionalEmpty[list[Server]] = Field(default_factory=list)
     security: OptionalEmpty[list[dict[str, list[str]]]] = Empty()
+    _schemas_by_name: dict[tuple[bool, bool], dict[str, SchemaType]] = {}
+    _parameters: list[tuple[str, ParameterType]] | None = None
+    _accept_headers: list[str] | None = None
+    _return_schema: tuple[SchemaType | None] | None = None
 
-    def get_parameters(self) -> Iterator[str, ParameterType]:
+    def get_parameters(self) -> list[tuple[str, ParameterType]]:
+        """Return (name, parameter) pairs, with the request body and form fields as parameters.
+
+        The list is computed once per operation, so that synthesized parameters are built once.
+        """
+        if self._parameters is None:
+            self._parameters = list(self._build_parameters())
+        return list(self._parameters)
+
+    def _build_parameters(self) -> Iterator[tuple[str, ParameterType]]:
         if self.parameters:
             for parameter in self.parameters:
                 if parameter().schema():
@@ -86,18 +106,26 @@ class OperationObject(_Base):
                     break
 
     def get_accept_headers(self) -> list[str]:
-        seen = []
+        if self._accept_headers is None:
+            self._accept_headers = self._build_accept_headers()
+        return list(self._accept_headers)
+
+    def _build_accept_headers(self) -> list[str]:
+        seen = {}
         for response in self.responses.values():
             if response().content:
-                for media_type in response().content:
-                    if media_type not in seen:
-                        seen.append(media_type)
+                seen.update(dict.fromkeys(response().content))
             else:
                 return [HEADER_ANY_TYPE]
 
-        return seen
+        return list(seen)
 
     def get_return_schema(self) -> SchemaType | None:
+        if self._return_schema is None:
+            self._return_schema = (self._build_return_schema(),)
+        return self._return_schema[0]
+
+    def _build_return_schema(self) -> SchemaType | None:
         for response in self.responses.values():
             for content in response().content.values():
                 if content.schema:
@@ -105,38 +133,44 @@ class OperationObject(_Base):
             return None
         return None
 
-    def schemas_by_name(
-        self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
-    ) -> dict[str, SchemaType]:
-        if mapping is None:
-            mapping = {}
+    def invalidate_caches(self) -> None:
+        """Drop the values derived from the operation, it must be called after mutating the operation."""
+        self._schemas_by_name = {}
+        self._parameters = None
+        self._accept_headers = None
+        self._return_schema = None
 
-        for _, parameter in self.get_parameters():
-            if parameter():
-                mapping.update(
-                    parameter().schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self)
-                )
+    def root_schemas(self) -> list[SchemaType]:
+        """Return the schemas directly used by the operation parameters, request body and responses.
 
+        Parameters are the ones of `get_parameters`, so that every form field is a root of its own.
+        """
+        roots = [parameter.schema for _, parameter in self.get_parameters() if parameter.schema]
         if self.requestBody:
-            for content in self.requestBody.content.values():
-                if content.schema():
-                    mapping.update(
-                        content.schema().schemas_by_name(
-                            mapping=mapping, recursive=recursive, include_self=include_self
-                        )
-                    )
-
+            # The request body schema counts as the operation's own, returned with `include_self` or when reached
+            # from another schema, while referenced parameter and response schemas are always returned.
+            roots.extend(content.schema() for content in self.requestBody.content.values())
         if self.responses:
             for response in self.responses.values():
                 if response().content:
-                    for content in response().content.values():
-                        if content.schema:
-                            mapping.update(
-                                content.schema.schemas_by_name(
-                                    mapping=mapping, recursive=recursive, include_self=include_self
-                                )
-                            )
+                    roots.extend(content.schema for content in response().content.values())
+        return roots
 
+    def schemas_by_name(
+        self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
+    ) -> dict[str, SchemaType]:
+        key = (recursive, include_self)
+        if key not in self._schemas_by_name:
+            self._schemas_by_name[key] = {
+                schema.name: schema
+                for schema in iter_schemas(self.root_schemas(), recursive=recursive, include_self=include_self)
+            }
+
+        if mapping is None:
+            return dict(self._schemas_by_name[key])
+
+        for name, schema in self._schemas_by_name[key].items():
+            mapping.setdefault(name, schema)
         return mapping
 
 
@@ -154,29 +188,17 @@ class PathsItemObject(_Base):
     patch: OptionalEmpty[OperationObject] = Empty()
     trace: OptionalEmpty[OperationObject] = Empty()
 
+    def operations(self) -> list[tuple[str, OperationObject]]:
+        """Return the defined operations as (method, operation) pairs."""
+        return [(method, getattr(self, method)) for method in HTTP_METHODS if getattr(self, method)]
+
     def schemas_by_name(
         self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
     ) -> dict[str, SchemaType]:
         if mapping is None:
             mapping = {}
 
-        if self.get:
-            mapping.update(self.get.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
-        if self.put:
-            mapping.update(self.put.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
-        if self.post:
-            mapping.update(self.post.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
-        if self.delete:
-            mapping.update(self.delete.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
-        if self.options:
-            mapping.update(
-                self.options.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self)
-            )
-        if self.head:
-            mapping.update(self.head.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
-        if self.patch:
-            mapping.update(self.patch.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
-        if self.trace:
-            mapping.update(self.trace.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
+        for _, operation in self.operations():
+            operation.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self)
 
         return mapping
@@ -9,7 +9,7 @@ from typing import Any, Literal, TypeAlias, Union
 from pydantic import Field
 
 from datadog_api_client_generator.openapi.schema_model import ArraySchema, SchemaType
-from datadog_api_client_generator.openapi.shared_model import RefObject, _Base
+from datadog_api_client_generator.openapi.shared_model import RefObject, _Base, iter_schemas
 from datadog_api_client_generator.openapi.utils import Empty, OptionalEmpty, StrBool
 
 
@@ -52,8 +52,8 @@ class Parameter(_Base):
         if mapping is None:
             mapping = {}
 
-        if self.schema:
-            mapping.update(self.schema.schemas_by_name(mapping=mapping, recursive=recursive, include_self=include_self))
+        for schema in iter_schemas([self.schema], recursive=recursive, include_self=include_self, known=mapping):
+            mapping[schema.name] = schema
 
         return mapping
 
@@ -64,11 +64,5 @@ class ParamRef(RefObject):
     def __call__(self) -> Parameter:
         return self._resolve_ref()
 
-    def _resolve_ref(self) -> Parameter:
-        if self._resolved_ref is None:
-            self._resolved_ref = getattr(self._root_openapi.get().components, self.ref_components_path).get(self.name)
-
-        return self._resolved_ref
-
 
 ParameterType: TypeAlias = Union[Parameter, ParamRef]
@@ -0,0 +1,150 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+"""Single pass preparation of a raw document for validation.
+
+The model validators remap extensions, inject reference properties and schema names node by node, and union types
+run them again for every member tried. `preprocess_spec` does the same work once per node of the raw document,
+guided by the field types of the models, and `preprocessed_validator` builds validators without those model
+validators for the prepared document.
+"""
+
+from __future__ import annotations
+
+import sys
+import types
+from typing import TYPE_CHECKING, Any, ForwardRef, Union, get_args, get_origin
+
+from pydantic import TypeAdapter
+from pydantic_core import SchemaValidator
+
+from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+from datadog_api_client_generator.openapi.shared_model import RefObject, _Base
+from datadog_api_client_generator.openapi.utils import get_name_and_path_from_ref
+
+if TYPE_CHECKING:
+    from pydantic.fields import FieldInfo
+
+# A node shape maps field aliases to child shapes, and whether the node may be a reference. A child shape is
+# ("node", shape), ("list", child) or ("map", child). Fields which cannot hold nodes are left out.
+_NodeShape = tuple[dict[str, tuple], bool]
+_NODE_SHAPES: dict[frozenset[type[_Base]], _NodeShape] = {}
+
+
+def _field_annotation(model: type[_Base], name: str, info: FieldInfo) -> Any:
+    # Annotations of models referencing types defined later in their module are kept unresolved by pydantic.
+    annotation = info.annotation
+    if isinstance(annotation, ForwardRef):
+        owner = next(cls for cls in model.__mro__ if name in vars(cls).get("__annotations__", {}))
+        annotation = eval(annotation.__forward_arg__, vars(sys.modules[owner.__module__]))  # noqa: S307
+    return annotation
+
+
+def _field_shape(annotation: Any) -> tuple | None:
+    args = get_args(annotation) if get_origin(annotation) in {Union, types.UnionType} else (annotation,)
+    models = frozenset(arg for arg in args if isinstance(arg, type) and issubclass(arg, _Base))
+    if models:
+        return "node", _node_shape(models)
+
+    for arg in args:
+        origin, params = get_origin(arg), get_args(arg)
+        if origin is list and params and (item := _field_shape(params[0])):
+            return "list", item
+        if origin is dict and params and (item := _field_shape(params[1])):
+            return "map", item
+    return None
+
+
+def _node_shape(models: frozenset[type[_Base]]) -> _NodeShape:
+    # Shapes are registered before their fields are computed, as schemas are recursive.
+    if models not in _NODE_SHAPES:
+        fields = {}
+        _NODE_SHAPES[models] = fields, any(issubclass(model, RefObject) for model in models)
+        for model in models:
+            for name, info in model.model_fields.items():
+                if shape := _field_shape(_field_annotation(model, name, info)):
+                    fields.setdefault(info.alias or name, shape)
+    return _NODE_SHAPES[models]
+
+
+def _prepare_node(node: dict[str, Any], *, is_ref: bool) -> None:
+    extensions = node.get("extensions", {})
+    for key in [key for key in node if isinstance(key, str) and key.startswith("x-")]:
+        extensions[key] = node.pop(key)
+    node["extensions"] = extensions
+
+    if is_ref and isinstance(node.get("$ref"), str):
+        parts = get_name_and_path_from_ref(node["$ref"])
+        if len(parts) == 2:  # noqa: PLR2004
+            node["ref_components_path"], node["name"] = parts
+
+
+def preprocess_spec(raw: dict[str, Any]) -> dict[str, Any]:
+    """Prepare a raw document in place for validation with a `preprocessed_validator`, and return it.
+
+    Extensions are moved to an `extensions` mapping, references get their component path and name, and component
+    schemas their name. Every node is visited once, with an explicit stack.
+    """
+    components = raw.get("components")
+    if isinstance(components, dict) and isinstance(components.get("schemas"), dict):
+        for name, schema in components["schemas"].items():
+            if isinstance(schema, dict):
+                schema["name"] = name
+
+    visited = set()
+    stack = [(raw, ("node", _node_shape(frozenset((OpenAPI,)))))]
+    while stack:
+        value, (kind, shape) = stack.pop()
+        if kind == "list":
+            if isinstance(value, list):
+                stack.extend((item, shape) for item in value)
+        elif kind == "map":
+            if isinstance(value, dict):
+                stack.extend((item, shape) for item in value.values())
+        elif isinstance(value, dict) and id(value) not in visited:
+            visited.add(id(value))
+            fields, is_ref = shape
+            _prepare_node(value, is_ref=is_ref)
+            stack.extend((value[alias], child) for alias, child in fields.items() if alias in value)
+
+    return raw
+
+
+def _strip_preparation(schema: Any, copies: dict[int, Any], models: set[type]) -> Any:
+    # Core schemas are trees of dicts and lists, possibly shared, whose before validator nodes wrap the schema they
+    # validate. `copies` maps already stripped nodes to their copy, and the classes of model nodes go in `models`.
+    if id(schema) in copies:
+        return copies[id(schema)]
+    if isinstance(schema, list):
+        return [_strip_preparation(item, copies, models) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+
+    if schema.get("type") == "function-before" and getattr(schema["function"]["function"], "__prepares_raw__", False):
+        copies[id(schema)] = _strip_preparation(schema["schema"], copies, models)
+    else:
+        if schema.get("type") == "model":
+            models.add(schema["cls"])
+        copy = copies[id(schema)] = {}
+        copy.update((key, _strip_preparation(value, copies, models)) for key, value in schema.items())
+    return copies[id(schema)]
+
+
+def preprocessed_validator(type_: Any) -> SchemaValidator:
+    """Return a validator of `type_` for documents prepared by `preprocess_spec`.
+
+    The model validators marked with `shared_model.prepares_raw` are left out of its core schema, so they are never
+    called instead of returning early on every node.
+    """
+    models: set[type] = set()
+    schema = _strip_preparation(TypeAdapter(type_).core_schema, {}, models)
+    # pydantic-core reuses the validator of complete models for their model nodes, which would call the stripped
+    # validators again. The models are marked incomplete while the validator is built from the stripped schema.
+    complete = [model for model in models if vars(model).get("__pydantic_complete__")]
+    for model in complete:
+        model.__pydantic_complete__ = False
+    try:
+        return SchemaValidator(schema)
+    finally:
+        for model in complete:
+            model.__pydantic_complete__ = True
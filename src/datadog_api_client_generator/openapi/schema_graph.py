@@ -0,0 +1,151 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from datadog_api_client_generator.openapi.schema_model import SchemaType
+
+
+def schema_dependencies(schema: SchemaType) -> list[str]:
+    """Return the names of the named schemas a schema directly depends on.
+
+    Inline schemas are walked through, named schemas (components) end the walk.
+    """
+    dependencies = {}
+    visited = set()
+    stack = list(reversed(schema().child_schemas()))
+    while stack:
+        child = stack.pop()()
+        if id(child) in visited:
+            continue
+        visited.add(id(child))
+
+        if child.name:
+            dependencies.setdefault(child.name, None)
+        else:
+            stack.extend(reversed(child.child_schemas()))
+
+    return list(dependencies)
+
+
+def _strongly_connected_components(edges: dict[str, tuple[str, ...]]) -> list[frozenset[str]]:
+    # Iterative Tarjan algorithm. Components are emitted after every component they depend on.
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components = []
+
+    for start in edges:
+        if start in index:
+            continue
+
+        index[start] = lowlink[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(edges[start]))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges[child])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == node:
+                            break
+                    components.append(frozenset(component))
+
+    return components
+
+
+class SchemaGraph:
+    """Dependency graph between named schemas.
+
+    Edges go from a schema to the named schemas it uses through properties, items, additionalProperties,
+    oneOf/anyOf/allOf and references, with inline schemas walked through.
+    """
+
+    def __init__(self, edges: dict[str, Iterable[str]]) -> None:
+        self._forward: dict[str, tuple[str, ...]] = {name: tuple(targets) for name, targets in edges.items()}
+        for targets in list(self._forward.values()):
+            for target in targets:
+                self._forward.setdefault(target, ())
+
+        reverse: dict[str, list[str]] = {name: [] for name in self._forward}
+        for name, targets in self._forward.items():
+            for target in targets:
+                reverse[target].append(name)
+        self._reverse = {name: tuple(sources) for name, sources in reverse.items()}
+
+        self._components = _strongly_connected_components(self._forward)
+        self._component_of = {name: component for component in self._components for name in component}
+
+    @classmethod
+    def from_schemas(cls, schemas: dict[str, SchemaType]) -> SchemaGraph:
+        """Build the graph of a mapping of named schemas."""
+        return cls({name: schema_dependencies(schema) for name, schema in schemas.items()})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._forward
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._forward)
+
+    def __len__(self) -> int:
+        return len(self._forward)
+
+    def dependencies(self, name: str) -> tuple[str, ...]:
+        """Return the schemas directly used by a schema."""
+        return self._forward[name]
+
+    def dependents(self, name: str) -> tuple[str, ...]:
+        """Return the schemas directly using a schema."""
+        return self._reverse[name]
+
+    def component(self, name: str) -> frozenset[str]:
+        """Return the strongly connected component of a schema."""
+        return self._component_of[name]
+
+    def is_cyclic(self, name: str) -> bool:
+        """Return whether a schema depends on itself, directly or not."""
+        return len(self._component_of[name]) > 1 or name in self._forward[name]
+
+    def strongly_connected_components(self) -> list[frozenset[str]]:
+        """Return strongly connected components, each after the components it depends on."""
+        return list(self._components)
+
+    def topological_order(self) -> list[str]:
+        """Return schema names with dependencies first. Schemas of a cycle are grouped together."""
+        return [name for component in self._components for name in sorted(component)]
+
+    def closure(self, names: Iterable[str], *, reverse: bool = False) -> set[str]:
+        """Return the given schemas and all schemas they depend on, or that depend on them with `reverse`."""
+        adjacency = self._reverse if reverse else self._forward
+        result = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in result:
+                result.add(name)
+                stack.extend(adjacency[name])
+        return result
@@ -5,14 +5,16 @@ from __future__ import annotations
 
 from typing import Any, Literal, TypeAlias, Union
 
-from datadog_api_client_generator.openapi.shared_model import RefObject, _Base
+from pydantic import Field
+
+from datadog_api_client_generator.openapi.shared_model import RefObject, _Base, iter_schemas
 from datadog_api_client_generator.openapi.utils import Empty, OptionalEmpty, StrBool
 
 
 class Schema(_Base):
     name: OptionalEmpty[str] = Empty()
     description: OptionalEmpty[str] = Empty()
-    required: list[str] = []
+    required: list[str] = Field(default_factory=list)
     type: OptionalEmpty[Literal["string", "number", "integer", "boolean", "array", "object"]] = Empty()
     format: OptionalEmpty[
         Literal["int32", "int64", "float", "double", "byte", "binary", "date", "date-time", "password", "email", "uuid"]
@@ -34,22 +36,20 @@ class Schema(_Base):
     readOnly: OptionalEmpty[StrBool] = Empty()
     writeOnly: OptionalEmpty[StrBool] = Empty()
 
+    def child_schemas(self) -> list[SchemaType]:
+        """Return the schemas directly nested in this schema."""
+        if isinstance(self.additionalProperties, _Base):
+            return [self.additionalProperties]
+        return []
+
     def schemas_by_name(
         self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
     ) -> dict[str, SchemaType]:
         if mapping is None:
             mapping = {}
 
-        if isinstance(self.additionalProperties, SchemaType) and self.additionalProperties().name:
-            if self.additionalProperties().name in mapping:
-                return mapping
-            mapping[self.additionalProperties().name] = self.additionalProperties()
-
-            if recursive:
-                mapping.update(self.additionalProperties().schemas_by_name(mapping=mapping, recursive=recursive))
-
-        if self.name and include_self:
-            mapping[self.name] = self
+        for schema in iter_schemas([self], recursive=recursive, include_self=include_self, known=mapping):
+            mapping[schema.name] = schema
 
         return mapping
 
@@ -57,135 +57,40 @@ class Schema(_Base):
 class OneOfSchema(Schema):
     oneOf: list[SchemaType]
 
-    def schemas_by_name(
-        self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
-    ) -> dict[str, SchemaType]:
-        if mapping is None:
-            mapping = {}
-
-        for oneOf in self.oneOf:
-            if oneOf().name:
-                if oneOf().name in mapping:
-                    continue
-                mapping[oneOf().name] = oneOf()
-
-                if recursive:
-                    mapping.update(oneOf().schemas_by_name(mapping=mapping))
-
-        if self.name and include_self:
-            mapping[self.name] = self
-
-        return mapping
+    def child_schemas(self) -> list[SchemaType]:
+        return [*self.oneOf, *super().child_schemas()]
 
 
 class EnumSchema(Schema):
     enum: list[str | int | float]
 
-    def schemas_by_name(
-        self, mapping: dict[str, SchemaType] | None = None, *, _recursive: bool = True, include_self: bool = True
-    ) -> dict[str, SchemaType]:
-        if mapping is None:
-            mapping = {}
-
-        if self.name and include_self:
-            mapping[self.name] = self
-
-        return mapping
-
 
 class AllOfSchema(Schema):
     allOf: list[SchemaType]
 
-    def schemas_by_name(
-        self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
-    ) -> dict[str, SchemaType]:
-        if mapping is None:
-            mapping = {}
-
-        for allOf in self.allOf:
-            if allOf().name:
-                if allOf().name in mapping:
-                    continue
-                mapping[allOf().name] = allOf()
-
-            if recursive:
-                mapping.update(allOf().schemas_by_name(mapping=mapping))
-
-        if self.name and include_self:
-            mapping[self.name] = self
-
-        return mapping
+    def child_schemas(self) -> list[SchemaType]:
+        return [*self.allOf, *super().child_schemas()]
 
 
 class AnyOfSchema(Schema):
     anyOf: list[SchemaType]
 
-    def schemas_by_name(
-        self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
-    ) -> dict[str, SchemaType]:
-        if mapping is None:
-            mapping = {}
-
-        for anyOf in self.anyOf:
-            if anyOf().name:
-                if anyOf().name in mapping:
-                    continue
-                mapping[anyOf().name] = anyOf()
-            if recursive:
-                mapping.update(anyOf().schemas_by_name(mapping=mapping))
-
-        if self.name and include_self:
-            mapping[self.name] = self
-
-        return mapping
+    def child_schemas(self) -> list[SchemaType]:
+        return [*self.anyOf, *super().child_schemas()]
 
 
 class ArraySchema(Schema):
     items: SchemaType
 
-    def schemas_by_name(
-        self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
-    ) -> dict[str, SchemaType]:
-        if mapping is None:
-            mapping = {}
-
-        if isinstance(self.items, SchemaType):
-            if self.items().name:
-                if self.items().name in mapping:
-                    return mapping
-                mapping[self.items().name] = self.items()
-
-            if recursive:
-                mapping.update(self.items().schemas_by_name(mapping=mapping))
-
-        if self.name and include_self:
-            mapping[self.name] = self
-
-        return mapping
+    def child_schemas(self) -> list[SchemaType]:
+        return [self.items, *super().child_schemas()]
 
 
 class ObjectSchema(Schema):
     properties: dict[str, SchemaType]
 
-    def schemas_by_name(
-        self, mapping: dict[str, SchemaType] | None = None, *, recursive: bool = True, include_self: bool = True
-    ) -> dict[str, SchemaType]:
-        if mapping is None:
-            mapping = {}
-
-        for p in self.properties.values():
-            if p().name:
-                if p().name in mapping:
-                    continue
-                mapping[p().name] = p()
-
-            if recursive:
-                mapping.update(p().schemas_by_name(mapping=mapping))
-
-        if self.name and include_self:
-            mapping[self.name] = self
-
-        return mapping
+    def child_schemas(self) -> list[SchemaType]:
+        return [*self.properties.values(), *super().child_schemas()]
 
 
 class SchemaRef(RefObject):
@@ -194,12 +99,6 @@ class SchemaRef(RefObject):
     def __call__(self) -> Schema:
         return self._resolve_ref()
 
-    def _resolve_ref(self) -> Schema:
-        if self._resolved_ref is None:
-            self._resolved_ref = getattr(self._root_openapi.get().components, self.ref_components_path).get(self.name)
-
-        return self._resolved_ref
-
 
 SchemaType: TypeAlias = Union[
     SchemaRef, ArraySchema, AnyOfSchema, AllOfSchema, EnumSchema, OneOfSchema, ObjectSchema, Schema
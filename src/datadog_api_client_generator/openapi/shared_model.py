@@ -3,23 +3,41 @@
 # This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, TypeAlias, Union
+from typing import TYPE_CHECKING, Any, TypeAlias, TypeVar, Union
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, ValidationInfo, model_validator
 
 from datadog_api_client_generator.openapi.utils import Empty, OptionalEmpty, get_name_and_path_from_ref
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Container, Iterable, Iterator
     from contextvars import ContextVar
 
     from datadog_api_client_generator.openapi.openapi_model import OpenAPI
 
+_Validator = TypeVar("_Validator", bound="Callable[..., Any]")
+
+
+def prepares_raw(validator: _Validator) -> _Validator:
+    """Mark a before model validator as preparing raw nodes, work done by `preprocess.preprocess_spec` instead."""
+    validator.__prepares_raw__ = True
+    return validator
+
+
+def node_fields(node: _Base) -> Iterable[tuple[str, Any]]:
+    """Return the names and values of the fields of a node, frozen or not."""
+    # Frozen nodes have no `__dict__`, see `frozen.FrozenNode`.
+    fields = getattr(node, "__dict__", None)
+    if fields is None:
+        return ((name, getattr(node, name)) for name in type(node).model_fields)
+    return fields.items()
+
 
 class _Base(BaseModel):
-    extensions: dict[str, Any] = {}
-    _root_openapi: ContextVar[OpenAPI] | None = None
+    extensions: dict[str, Any] = Field(default_factory=dict)
 
     @model_validator(mode="before")
+    @prepares_raw
     def _remap_extensions(cls, v: object) -> dict:  # noqa: N805
         if not isinstance(v, BaseModel) and callable(v.keys):
             # Remap extensions
@@ -32,24 +50,32 @@ class _Base(BaseModel):
 
         return v
 
-    @model_validator(mode="after")
-    def _inject_ctx_after(self, v: object) -> dict:
-        if v.context:
-            self._root_openapi = v.context.get("openapi")
-
-        return self
-
     def __call__(self) -> Any:
         return self
 
+    def iter_nodes(self) -> Iterator[_Base]:
+        """Return this node and all its descendant nodes, depth first."""
+        stack = [self]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, _Base):
+                yield value
+                stack.extend(child for name, child in node_fields(value) if name != "extensions")
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+
 
 class RefObject(_Base):
     ref: str = Field(alias="$ref")
     name: str
     ref_components_path: str
+    _root_openapi: ContextVar[OpenAPI] | None = None
     _resolved_ref: Any = None
 
     @model_validator(mode="before")
+    @prepares_raw
     def _inject_ref_properties(cls, v: object) -> dict:  # noqa: N805
         if "$ref" in v:
             path, name = get_name_and_path_from_ref(v["$ref"])
@@ -57,29 +83,94 @@ class RefObject(_Base):
             v["name"] = name
         return v
 
+    @model_validator(mode="after")
+    def _inject_ctx_after(self, v: ValidationInfo) -> dict:
+        # Only references need the document, the other nodes do not carry it.
+        if v.context:
+            self._root_openapi = v.context.get("openapi")
+
+        return self
+
     def __call__(self) -> Any:
         return self._resolve_ref()
 
+    def bind(self, ref_index: dict[str, Any], root_openapi: ContextVar[OpenAPI] | None = None) -> Any:
+        """Bind the reference to its target in a document components index and return the target.
+
+        The document variable, lost when the reference is pickled, is replaced by `root_openapi` if given.
+        """
+        if root_openapi is not None:
+            self._root_openapi = root_openapi
+        self._resolved_ref = ref_index.get(f"#/components/{self.ref_components_path}/{self.name}")
+        return self._resolved_ref
+
     def _resolve_ref(self) -> Any:
-        if not self._resolved_ref:
+        # References are bound by `OpenAPI` once validated, this only handles nodes created outside of a document.
+        if self._resolved_ref is None:
             self._resolved_ref = getattr(self._root_openapi.get().components, self.ref_components_path).get(self.name)
         return self._resolved_ref
 
+    def __getstate__(self) -> dict[str, Any]:
+        # The document variable and the bound references are restored by `OpenAPI` when unpickled, which keeps pickles
+        # shallow.
+        state = super().__getstate__()
+        state["__pydantic_private__"] = {**state["__pydantic_private__"], "_root_openapi": None, "_resolved_ref": None}
+        return state
+
     def schemas_by_name(
         self, mapping: dict[str, Any] | None = None, *, recursive: bool = True, include_self: bool = True
     ) -> dict[str, Any]:
         if mapping is None:
             mapping = {}
 
-        if recursive:
-            mapping.update(self().schemas_by_name(mapping=mapping))
-
-        if self.name and include_self:
-            mapping[self.name] = self()
+        for schema in iter_schemas([self], recursive=recursive, include_self=include_self, known=mapping):
+            mapping[schema.name] = schema
 
         return mapping
 
 
+def iter_schemas(
+    roots: Iterable[Any], *, recursive: bool = True, include_self: bool = True, known: Container[str] = ()
+) -> Iterator[Any]:
+    """Return the named schemas reachable from `roots`, each name once.
+
+    The schema graph is walked depth first with an explicit stack and every node is walked at most twice, once as a
+    root and once where it is returned, so the cost is linear in the number of schema nodes whatever the nesting
+    depth. Schemas are returned when first reached, and
+    named roots after the schemas they reach: `A -> B -> C` gives `B, C, A`. Without `recursive`, only the direct
+    children of the roots are considered and a reference root stops at its target. Names in `known` are neither
+    returned nor walked through. Named roots are returned with `include_self`, and reference roots also with
+    `recursive`, as they stand for their target rather than for themselves.
+    """
+    visited = set()
+    names = set()
+    stack = [(root, True, False) for root in reversed(list(roots)) if root]
+    while stack:
+        node, is_root, done = stack.pop()
+        schema = node()
+        if done:
+            if schema.name not in names:
+                names.add(schema.name)
+                yield schema
+            continue
+
+        # Named schemas are walked from where they are returned, roots and unnamed schemas on their first visit.
+        if schema.name and not is_root:
+            if schema.name in known or schema.name in names:
+                continue
+            names.add(schema.name)
+            yield schema
+        elif id(schema) in visited:
+            continue
+
+        is_ref = isinstance(node, RefObject)
+        if is_root and schema.name and (include_self or (recursive and is_ref)):
+            stack.append((node, True, True))
+        if recursive or (is_root and not is_ref):
+            visited.add(id(schema))
+            stack.extend((child, False, False) for child in reversed(schema.child_schemas()))
+
+
 class ExternalDocs(_Base):
     url: str
     description: OptionalEmpty[str] = Empty()
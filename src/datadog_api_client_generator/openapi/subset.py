@@ -0,0 +1,103 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+"""Restriction of a raw document to some of its operations, before validation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from datadog_api_client_generator.openapi.operation_model import HTTP_METHODS
+
+COMPONENTS_REF_PREFIX = "#/components/"
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Operations selected by first tag, operationId or path prefix.
+
+    An operation is selected when it matches any of the selectors.
+    """
+
+    tags: frozenset[str] = frozenset()
+    operation_ids: frozenset[str] = frozenset()
+    path_prefixes: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.tags or self.operation_ids or self.path_prefixes)
+
+    def matches(self, path: str, operation: dict[str, Any]) -> bool:
+        tags = operation.get("tags") or [None]
+        return (
+            tags[0] in self.tags
+            or operation.get("operationId") in self.operation_ids
+            or path.startswith(self.path_prefixes)
+        )
+
+    def key(self) -> str:
+        """Return a stable representation of the selection, used in cache keys."""
+        return "|".join(
+            (",".join(sorted(self.tags)), ",".join(sorted(self.operation_ids)), ",".join(sorted(self.path_prefixes)))
+        )
+
+
+def _component_refs(value: Any) -> list[tuple[str, str]]:
+    refs = []
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            ref = value.get("$ref")
+            if isinstance(ref, str) and ref.startswith(COMPONENTS_REF_PREFIX):
+                section, _, name = ref.removeprefix(COMPONENTS_REF_PREFIX).partition("/")
+                refs.append((section, name))
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return refs
+
+
+def select_operations(raw: dict[str, Any], selection: Selection) -> dict[str, Any]:
+    """Restrict a raw document in place to the selected operations and the components they reach, and return it.
+
+    Components are kept when referenced, directly or through other components, from the selected operations or
+    their path items, whatever the keyword holding the reference. Tags are restricted to the ones of the selected
+    operations, security schemes and the other sections are kept.
+    """
+    paths = {}
+    for path, item in (raw.get("paths") or {}).items():
+        if not isinstance(item, dict):
+            continue
+        selected = {method for method in HTTP_METHODS if isinstance(item.get(method), dict)}
+        selected = {method for method in selected if selection.matches(path, item[method])}
+        if selected:
+            paths[path] = {key: value for key, value in item.items() if key not in HTTP_METHODS or key in selected}
+    raw["paths"] = paths
+
+    components = raw.get("components")
+    if isinstance(components, dict):
+        reached = set()
+        pending = _component_refs(paths)
+        while pending:
+            section, name = pending.pop()
+            if (section, name) in reached or name not in (components.get(section) or {}):
+                continue
+            reached.add((section, name))
+            pending.extend(_component_refs(components[section][name]))
+
+        for section, values in components.items():
+            if section != "securitySchemes" and isinstance(values, dict):
+                components[section] = {name: value for name, value in values.items() if (section, name) in reached}
+
+    if isinstance(raw.get("tags"), list):
+        used = {
+            tag
+            for item in paths.values()
+            for method in HTTP_METHODS
+            if isinstance(operation := item.get(method), dict)
+            for tag in operation.get("tags") or ()
+        }
+        raw["tags"] = [tag for tag in raw["tags"] if isinstance(tag, dict) and tag.get("name") in used]
+
+    return raw
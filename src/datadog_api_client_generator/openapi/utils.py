@@ -3,6 +3,9 @@
 # This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
 from __future__ import annotations
 
+import importlib.metadata
+import json
+import pickle
 from typing import TYPE_CHECKING, Annotated, TypeVar, Union
 
 import yaml
@@ -10,11 +13,17 @@ from jinja2 import Undefined
 from pydantic import GetCoreSchemaHandler, PlainValidator
 from pydantic_core import core_schema
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 if TYPE_CHECKING:
     from pathlib import PosixPath
 
 
 HEADER_ANY_TYPE = "*/*"
+NORMALIZED_SUFFIX = ".pickle"
 
 
 # Annotated str class. Used to convert string to Bool values.
@@ -42,10 +51,116 @@ OptionalEmpty = Union[T, type(None), Empty]
 
 def load_yaml(path: PosixPath) -> dict:
     """Return openapi specification from yaml file."""
-    with path.open() as fp:
-        return yaml.load(fp, Loader=yaml.CSafeLoader)
+    return parse_yaml(path.read_bytes())
+
+
+def parse_yaml(data: bytes) -> dict:
+    """Return openapi specification from yaml content."""
+    return yaml.load(data, Loader=yaml.CSafeLoader)
+
+
+def parse_json(data: bytes) -> dict:
+    """Return openapi specification from json content, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse_pickle(data: bytes) -> dict:
+    """Return openapi specification from a normalized spec written by `dump_normalized`."""
+    # Normalized specs are produced by the generator itself (`generate --emit-normalized`).
+    return pickle.loads(data)  # noqa: S301
+
+
+SPEC_PARSERS = {
+    ".yaml": parse_yaml,
+    ".yml": parse_yaml,
+    ".json": parse_json,
+    NORMALIZED_SUFFIX: parse_pickle,
+}
+
+
+def parse_spec(data: bytes, suffix: str) -> dict:
+    """Return openapi specification from file content, parsed according to the file suffix."""
+    try:
+        parser = SPEC_PARSERS[suffix.lower()]
+    except KeyError:
+        msg = f"unsupported spec format {suffix!r}, expected one of {', '.join(SPEC_PARSERS)}"
+        raise ValueError(msg) from None
+    return parser(data)
+
+
+def dump_normalized(spec: dict) -> bytes:
+    """Return the normalized binary form of a parsed openapi specification."""
+    return pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _is_ref(value: object) -> bool:
+    return isinstance(value, dict) and isinstance(value.get("$ref"), str)
+
+
+def resolve_refs(document: dict) -> dict:
+    """Replace every `$ref` object of a parsed document with the object it points to, in place.
+
+    Each reference is resolved once and all its occurrences share the same object, so recursive schemas result in
+    cyclic structures. Only local references (`#/...`) are supported.
+    """
+    resolved: dict[str, object] = {}
+
+    def target(ref: str) -> object:
+        chain = []
+        current = ref
+        while current not in resolved:
+            if current in chain:
+                msg = f"circular reference: {' -> '.join([*chain, current])}"
+                raise ValueError(msg)
+            chain.append(current)
+            if not current.startswith("#"):
+                msg = f"unsupported non-local reference: {current}"
+                raise ValueError(msg)
+
+            value = document
+            for token in current[1:].split("/")[1:]:
+                if _is_ref(value):
+                    value = target(value["$ref"])
+                key = token.replace("~1", "/").replace("~0", "~")
+                value = value[int(key)] if isinstance(value, list) else value[key]
+
+            if not _is_ref(value):
+                resolved[current] = value
+                break
+            current = value["$ref"]
+
+        for r in chain:
+            resolved[r] = resolved[current]
+        return resolved[ref]
+
+    visited = set()
+    stack = [document]
+    while stack:
+        container = stack.pop()
+        if id(container) in visited:
+            continue
+        visited.add(id(container))
+
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in list(items):
+            if _is_ref(value):
+                value = container[key] = target(value["$ref"])  # noqa: PLW2901
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+
+    return document
 
 
 def get_name_and_path_from_ref(ref: str) -> tuple[str, str]:
     """Return name and path from $ref value."""
     return ref.split("/")[-2:]
+
+
+def package_version() -> str:
+    """Return the installed version of the generator, "0" when it is not installed."""
+    try:
+        return importlib.metadata.version("datadog-api-client-generator")
+    except importlib.metadata.PackageNotFoundError:
+        return "0"
@@ -0,0 +1,105 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import contextlib
+import json
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import PosixPath
+
+
+def peak_rss() -> int | None:
+    """Return the peak resident set size in bytes of this process and its waited for children, if available."""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    )
+    # Reported in bytes on macOS and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageTiming:
+    stage: str
+    # Spec version, or generator name for the stages of a generator.
+    version: str | None
+    wall: float
+    cpu: float
+    # High-water mark of the process when the stage ended, not the memory used by the stage itself.
+    peak_rss: int | None
+
+
+@dataclass
+class TemplateTiming:
+    count: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class Timings:
+    """Wall time, CPU time and peak memory of the stages of a run, and render times by template.
+
+    CPU time is the one of the process recording the stage, stages run in worker processes are recorded there and
+    added with `extend`.
+    """
+
+    def __init__(self) -> None:
+        self.stages: list[StageTiming] = []
+        self.templates: dict[str, TemplateTiming] = {}
+        # Cache statistics of the memoized template filters.
+        self.filters: dict[str, dict[str, Any]] = {}
+        # Generators may run in threads.
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, version: str | None = None) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.stages.append(
+                StageTiming(name, version, time.perf_counter() - wall, time.process_time() - cpu, peak_rss())
+            )
+
+    def extend(self, stages: list[StageTiming]) -> None:
+        self.stages.extend(stages)
+
+    def record_render(self, template: str, seconds: float) -> None:
+        with self._lock:
+            timing = self.templates.setdefault(template, TemplateTiming())
+            timing.count += 1
+            timing.seconds += seconds
+            timing.max_seconds = max(timing.max_seconds, seconds)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "stages": [asdict(stage) for stage in self.stages],
+            "templates": {name: asdict(timing) for name, timing in sorted(self.templates.items())},
+            "filters": self.filters,
+            "peak_rss": peak_rss(),
+        }
+
+    def write(self, path: PosixPath) -> None:
+        """Write the report as JSON."""
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+
+
+def stage(timings: Timings | None, name: str, version: str | None = None) -> contextlib.AbstractContextManager:
+    """Return a context manager recording a stage in `timings`, or doing nothing without timings."""
+    if timings is None:
+        return contextlib.nullcontext()
+    return timings.stage(name, version)
@@ -0,0 +1,121 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from datadog_api_client_generator.codegen.shared.templates_env import template_directories
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from pathlib import PosixPath
+
+    from datadog_api_client_generator.codegen.shared.base_codegen import BaseCodegen
+    from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+
+logger = logging.getLogger(__name__)
+
+
+class PollingWatcher:
+    """Report the files changed since the previous poll, from their modification time and size.
+
+    Watched files are the given paths and the files matching `pattern` under the given directories, so that added and
+    removed files are reported too.
+    """
+
+    def __init__(self, paths: Iterable[PosixPath], directories: Iterable[PosixPath] = (), *, pattern: str = "*"):
+        self.paths = list(paths)
+        self.directories = list(directories)
+        self.pattern = pattern
+        self._state = self._snapshot()
+
+    def _snapshot(self) -> dict[PosixPath, tuple[int, int]]:
+        files = list(self.paths)
+        for directory in self.directories:
+            files.extend(directory.rglob(self.pattern))
+
+        state = {}
+        for path in files:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def poll(self) -> set[PosixPath]:
+        state = self._snapshot()
+        changed = {path for path in state.keys() | self._state.keys() if state.get(path) != self._state.get(path)}
+        self._state = state
+        return changed
+
+    def wait(self, interval: float) -> set[PosixPath]:
+        """Poll every `interval` seconds until files changed and return them.
+
+        Polling goes on until a poll finds no more changes, so that files saved in several writes are reported once.
+        """
+        changed = set()
+        while True:
+            time.sleep(interval)
+            latest = self.poll()
+            if changed and not latest:
+                return changed
+            changed |= latest
+
+
+class WatchSession:
+    """Regenerate the output of a generator when its specs or templates change.
+
+    The generator, its templates environment and the validated specs are kept between regenerations. Only changed
+    specs are loaded again with `load`, and the generator manifest skips the outputs whose inputs did not change.
+    Generators of one shard are not supported, as their shard plan is computed from all the specs.
+    """
+
+    def __init__(
+        self,
+        generator: BaseCodegen,
+        specs: dict[str, OpenAPI],
+        paths: Sequence[PosixPath],
+        output: PosixPath,
+        *,
+        load: Callable[[PosixPath], OpenAPI],
+    ) -> None:
+        if generator.shard is not None:
+            msg = "watch mode does not support sharded generation"
+            raise ValueError(msg)
+        self.generator = generator
+        self.specs = specs
+        self.paths = list(paths)
+        self.output = output
+        self.load = load
+        self.watcher = PollingWatcher(self.paths, template_directories(generator.env), pattern="*.j2")
+
+    def apply(self, changed: set[PosixPath]) -> None:
+        """Reload templates if any changed, load the changed specs, and regenerate.
+
+        Errors are logged and the previous version of invalid specs kept, so that the next change is picked up.
+        """
+        start = time.perf_counter()
+        changed_specs = [path for path in self.paths if path in changed]
+        try:
+            if len(changed) > len(changed_specs):
+                self.generator.reload_templates()
+            for path in changed_specs:
+                self.specs[path.parent.name] = self.load(path)
+            self.generator.generate(specs=self.specs, output=self.output)
+        except Exception:
+            logger.exception("Regeneration failed, waiting for the next change")
+        else:
+            logger.info("Regenerated %s in %.3fs", ", ".join(sorted(map(str, changed))), time.perf_counter() - start)
+
+    def run(self, interval: float = 0.5) -> None:
+        """Regenerate on every change until interrupted."""
+        logger.info("Watching %d specs and the templates for changes", len(self.paths))
+        try:
+            while True:
+                self.apply(self.watcher.wait(interval))
+        except KeyboardInterrupt:
+            logger.info("Stopped watching")
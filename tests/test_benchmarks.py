@@ -0,0 +1,24 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+from benchmarks.bench_pipeline import STAGES, benchmark
+from benchmarks.synthetic import SpecShape, synthetic_spec
+from datadog_api_client_generator.openapi.loader import validate_spec
+
+
+def test_synthetic_spec_shape():
+    shape = SpecShape(paths=4, schemas=10, one_of_depth=3, ref_fan_out=2, tags=2)
+    spec = validate_spec(synthetic_spec(shape))
+
+    assert len(spec.paths) == shape.paths
+    assert list(spec.group_apis_by_tag()) == ["Tag0", "Tag1"]
+    assert spec.schema_graph().dependencies("Model0") == ("Model1", "Model2", "Model3")
+    assert spec.components.schemas["Model0"].properties["variant"].oneOf[1].oneOf[1].oneOf[1].enum == ["a", "b"]
+
+
+def test_benchmark_smoke(tmp_path):
+    results = benchmark(SpecShape(paths=4, schemas=8, tags=2), tmp_path, repeat=1)
+
+    assert [result.stage for result in results] == list(STAGES)
+    assert all(result.seconds >= 0 and result.peak_bytes >= 0 for result in results)
+    assert sorted(p.name for p in (tmp_path / "output0" / "v2" / "apis").iterdir()) == ["Tag0.py", "Tag1.py"]
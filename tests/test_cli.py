@@ -0,0 +1,90 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+import pathlib
+import shutil
+
+import pytest
+from click.testing import CliRunner
+
+from datadog_api_client_generator.cli import cli
+from datadog_api_client_generator.codegen import GENERATORS
+from tests.test_codegen import ShardedCodegen
+
+EXAMPLES = pathlib.Path(__file__).parent / "examples"
+
+
+@pytest.fixture(autouse=True)
+def _generators(monkeypatch):
+    # The generator choices are read when the commands are defined.
+    monkeypatch.setitem(GENERATORS, "sharded", ShardedCodegen)
+    for command in (cli.commands["generate"], cli.commands["merge"]):
+        option = next(param for param in command.params if param.name in {"generators", "generator"})
+        monkeypatch.setattr(option.type, "choices", ["sharded"])
+
+
+@pytest.fixture
+def spec_path(tmp_path):
+    (tmp_path / "v1").mkdir()
+    return shutil.copy(EXAMPLES / "openapi.yaml", tmp_path / "v1" / "openapi.yaml")
+
+
+def _files(directory):
+    return {path.relative_to(directory).as_posix(): path.read_bytes() for path in directory.rglob("*.txt")}
+
+
+def _generate(spec_path, output):
+    result = CliRunner().invoke(cli, ["generate", "-g", "sharded", "-o", str(output), "--no-cache", str(spec_path)])
+    assert result.exit_code == 0, result.output
+    return _files(output)
+
+
+# Without arguments, click shows the help as a usage error.
+@pytest.mark.parametrize(("args", "exit_code"), [([], 2), (["--help"], 0)])
+def test_group_help(args, exit_code):
+    result = CliRunner().invoke(cli, args)
+
+    assert result.exit_code == exit_code
+    assert all(command in result.output for command in ("generate", "merge", "diff"))
+
+
+def test_default_command(spec_path, tmp_path):
+    result = CliRunner().invoke(cli, ["-g", "sharded", "-o", str(tmp_path / "out"), "--no-cache", str(spec_path)])
+
+    assert result.exit_code == 0, result.output
+    assert _files(tmp_path / "out") == _generate(spec_path, tmp_path / "expected")
+
+
+def test_shard_and_merge(spec_path, tmp_path):
+    expected = _generate(spec_path, tmp_path / "expected")
+    runner = CliRunner()
+
+    shard_args = []
+    for shard in ("1/2", "2/2"):
+        output = tmp_path / f"shard{shard[0]}"
+        result = runner.invoke(
+            cli, ["-g", "sharded", "-o", str(output), "--shard", shard, "--no-cache", str(spec_path)]
+        )
+        assert result.exit_code == 0, result.output
+        shard_args += ["-s", str(output)]
+    result = runner.invoke(
+        cli, ["merge", "-g", "sharded", "-o", str(tmp_path / "out"), *shard_args, "--no-cache", str(spec_path)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert expected
+    assert _files(tmp_path / "out") == expected
+
+    result = runner.invoke(
+        cli, ["merge", "-g", "sharded", "-o", str(tmp_path / "out"), *shard_args[:2], "--no-cache", str(spec_path)]
+    )
+    assert result.exit_code == 1
+    assert "exactly once" in result.output
+
+
+@pytest.mark.parametrize(("option", "message"), [("--shard=1/2", "--shard"), ("--intern-schemas", "--intern-schemas")])
+def test_watch_rejected(spec_path, tmp_path, option, message):
+    result = CliRunner().invoke(cli, ["-g", "sharded", "-o", str(tmp_path / "out"), "--watch", option, str(spec_path)])
+
+    assert result.exit_code == 2  # noqa: PLR2004
+    assert f"--watch cannot be combined with {message}" in result.output
@@ -0,0 +1,287 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+import json
+import pathlib
+import shutil
+
+import pytest
+import yaml
+from jinja2 import ChoiceLoader, DictLoader
+
+from datadog_api_client_generator.codegen.shared.base_codegen import BaseCodegen, GeneratorConfig
+from datadog_api_client_generator.codegen.shared.manifest import MANIFEST_FILENAME, Manifest
+from datadog_api_client_generator.codegen.shared.render import RenderError, RenderJob
+from datadog_api_client_generator.codegen.shared.shard import Shard, ShardPlan, merge_shards, write_shard_metadata
+from datadog_api_client_generator.codegen.shared.writer import OutputWriter
+from datadog_api_client_generator.openapi.loader import load_spec
+from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+from datadog_api_client_generator.openapi.utils import load_yaml
+from datadog_api_client_generator.timings import Timings
+from datadog_api_client_generator.watch import PollingWatcher, WatchSession
+
+EXAMPLES = pathlib.Path(__file__).parent / "examples"
+
+
+TEMPLATES = {
+    "model.j2": "{{ model.name | snake_case }}:{% for s in model.schemas_by_name(include_self=False) %}{{ s }}{% endfor %}",
+    "broken.j2": "{{ model.missing.attribute }}",
+}
+
+
+class DummyCodegen(BaseCodegen):
+    generator_config = GeneratorConfig()
+
+    def _build_env(self, **kwargs):
+        env = super()._build_env(**kwargs)
+        env.loader = ChoiceLoader([env.loader, DictLoader(TEMPLATES)])
+        return env
+
+    def generate(self, specs, output):
+        self.load_manifest(output)
+        for spec in specs.values():
+            for name in spec.components.schemas:
+                path = f"models/{name}.txt"
+                if self.is_dirty(path, self.inputs_digest(spec=spec, schemas=[name])):
+                    (output / "models").mkdir(parents=True, exist_ok=True)
+                    (output / path).write_text(name)
+        self.manifest.save()
+
+
+class ShardedCodegen(DummyCodegen):
+    def generate(self, specs, output):
+        self.load_manifest(output)
+        writer = OutputWriter(output, manifest=self.manifest, atomic=False)
+        for version, spec in specs.items():
+            for tag, operations in spec.group_apis_by_tag().items():
+                if self.owns_tag(version, tag):
+                    writer.write(f"{version}/apis/{tag}.txt", " ".join(op.operationId for _, _, op in operations))
+            for name in spec.components.schemas:
+                if self.owns_schema(version, name):
+                    self.is_dirty(f"{version}/models/{name}.txt", self.inputs_digest(spec=spec, schemas=[name]))
+                    writer.write(f"{version}/models/{name}.txt", name)
+        writer.commit()
+
+    def generate_shared(self, specs, output):
+        self.load_manifest(output)
+        writer = OutputWriter(output, manifest=self.manifest, atomic=False)
+        for version in specs:
+            for name in self.shard_plan.shared_schemas(version):
+                writer.write(f"{version}/models/{name}.txt", name)
+        writer.commit()
+
+
+@pytest.fixture
+def raw_spec():
+    return load_yaml(EXAMPLES / "openapi.yaml")
+
+
+def test_incremental_generation(raw_spec, tmp_path):
+    generator = DummyCodegen()
+    generator.generate({"v1": OpenAPI.model_validate(raw_spec, context={})}, tmp_path)
+    assert generator.manifest.stale_files() == []
+
+    raw_spec["components"]["schemas"]["NewPet"]["properties"]["age"] = {"type": "integer"}
+    generator.generate({"v1": OpenAPI.model_validate(raw_spec, context={})}, tmp_path)
+
+    dirty = {
+        path for path in generator.manifest.files if generator.manifest.previous[path] != generator.manifest.files[path]
+    }
+    assert dirty == {"models/NewPet.txt", "models/Pet.txt"}
+
+
+@pytest.mark.parametrize(("workers", "use_processes"), [(1, False), (4, False), (2, True)])
+def test_render(raw_spec, workers, use_processes):
+    spec = OpenAPI.model_validate(raw_spec, context={})
+    jobs = [RenderJob("model.j2", f"{name}.txt", {"model": model}) for name, model in spec.components.schemas.items()]
+
+    outputs = DummyCodegen().render(jobs, workers=workers, use_processes=use_processes, shared=spec)
+
+    assert outputs == ["pet:NewPet", "new_pet:", "error:"]
+
+
+def test_render_errors(raw_spec):
+    spec = OpenAPI.model_validate(raw_spec, context={})
+    jobs = [
+        RenderJob("model.j2", "Pet.txt", {"model": spec.components.schemas["Pet"]}),
+        RenderJob("broken.j2", "Error.txt", {"model": spec.components.schemas["Error"]}),
+        RenderJob("missing.j2", "NewPet.txt", {"model": spec.components.schemas["NewPet"]}),
+    ]
+
+    with pytest.raises(RenderError) as excinfo:
+        DummyCodegen().render(jobs, workers=2)
+
+    assert [job.output for job, _ in excinfo.value.failures] == ["Error.txt", "NewPet.txt"]
+
+
+def test_render_timings(raw_spec):
+    spec = OpenAPI.model_validate(raw_spec, context={})
+    jobs = [RenderJob("model.j2", f"{name}.txt", {"model": model}) for name, model in spec.components.schemas.items()]
+    generator = DummyCodegen()
+    generator.timings = Timings()
+
+    generator.render(jobs, workers=2)
+
+    assert list(generator.timings.templates) == ["model.j2"]
+    assert generator.timings.templates["model.j2"].count == len(jobs)
+
+
+def test_render_keys(raw_spec):
+    spec = OpenAPI.model_validate(raw_spec, context={})
+    jobs = [
+        RenderJob("model.j2", f"{version}/{name}.txt", {"model": model}, key=name)
+        for version in ("v1", "v2")
+        for name, model in spec.components.schemas.items()
+    ]
+    generator = DummyCodegen()
+    generator.timings = Timings()
+
+    outputs = generator.render(jobs, workers=2)
+
+    assert outputs == ["pet:NewPet", "new_pet:", "error:"] * 2
+    assert generator.timings.templates["model.j2"].count == len(spec.components.schemas)
+
+
+def test_templates_archive(raw_spec, tmp_path):
+    archive = tmp_path / "templates.zip"
+    DummyCodegen().precompile_templates(archive)
+
+    generator = DummyCodegen(templates_archive=archive)
+    # Drop the in-memory templates so that only the archive can provide them.
+    generator.env.loader = generator.env.loader.loaders[0]
+    spec = OpenAPI.model_validate(raw_spec, context={})
+    jobs = [RenderJob("model.j2", "Pet.txt", {"model": spec.components.schemas["Pet"]})]
+
+    assert generator.render(jobs) == ["pet:NewPet"]
+
+
+def test_templates_archive_sources(tmp_path, monkeypatch):
+    archive = tmp_path / "templates.zip"
+    generator = DummyCodegen()
+    assert generator.templates_archive_stale(archive)
+    generator.precompile_templates(archive)
+    assert not generator.templates_archive_stale(archive)
+
+    # Digests are read from the template sources, which the archive does not hold.
+    archived = DummyCodegen(templates_archive=archive)
+    assert archived.inputs_digest(templates=["model.j2"]) == generator.inputs_digest(templates=["model.j2"])
+
+    monkeypatch.setitem(TEMPLATES, "model.j2", "{{ model.name }}")
+    assert generator.templates_archive_stale(archive)
+
+
+@pytest.mark.parametrize("atomic", [True, False])
+def test_output_writer(tmp_path, atomic):
+    output = tmp_path / "output"
+    manifest = Manifest.load(output, "test")
+    writer = OutputWriter(output, manifest=manifest, atomic=atomic)
+    for path in ("a.txt", "b/b.txt", "c/c.txt"):
+        manifest.is_dirty(path, "")
+        writer.write(path, path)
+    assert writer.commit().written == [MANIFEST_FILENAME, "a.txt", "b/b.txt", "c/c.txt"]
+    unchanged_stat = (output / "a.txt").stat()
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "keep.txt").write_text("keep")
+    (output / "linked").symlink_to("../shared")
+
+    manifest = Manifest.load(output, "test")
+    writer = OutputWriter(output, manifest=manifest, atomic=atomic)
+    for path, content in (("a.txt", "a.txt"), ("b/b.txt", "changed")):
+        manifest.is_dirty(path, "")
+        writer.write(path, content)
+    result = writer.commit()
+
+    assert result.written == [MANIFEST_FILENAME, "b/b.txt"]
+    assert result.unchanged == ["a.txt"]
+    assert result.deleted == ["c/c.txt"]
+    assert (output / "b/b.txt").read_text() == "changed"
+    assert not (output / "c").exists()
+    assert (output / "a.txt").stat().st_mtime_ns == unchanged_stat.st_mtime_ns
+    assert (output / "a.txt").stat().st_ino == unchanged_stat.st_ino
+    assert (output / "linked").is_symlink()
+    assert (output / "linked" / "keep.txt").read_text() == "keep"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["output", "shared"]
+
+
+def test_watch_session(raw_spec, tmp_path):
+    paths = [tmp_path / version / "openapi.yaml" for version in ("v1", "v2")]
+    for path in paths:
+        path.parent.mkdir()
+        shutil.copy(EXAMPLES / "openapi.yaml", path)
+    loaded = []
+
+    def load(path):
+        loaded.append(path)
+        return load_spec(path)
+
+    generator = DummyCodegen()
+    output = tmp_path / "output"
+    specs = {path.parent.name: load_spec(path) for path in paths}
+    generator.generate(specs, output)
+    unchanged = specs["v1"]
+    session = WatchSession(generator, specs, paths, output, load=load)
+    templates = tmp_path / "templates"
+    session.watcher = PollingWatcher(paths, [templates], pattern="*.j2")
+
+    raw_spec["components"]["schemas"]["Owner"] = {"type": "object"}
+    paths[1].write_text(yaml.safe_dump(raw_spec))
+    session.apply(session.watcher.poll())
+
+    assert loaded == [paths[1]]
+    assert specs["v1"] is unchanged
+    assert (output / "models/Owner.txt").is_file()
+
+    env = generator.env
+    templates.mkdir()
+    (templates / "model.j2").write_text("{{ model.name }}")
+    session.apply(session.watcher.poll())
+
+    assert loaded == [paths[1]]
+    assert generator.env is not env
+
+    generator.shard = Shard(0, 2)
+    with pytest.raises(ValueError, match="sharded"):
+        WatchSession(generator, specs, paths, output, load=load)
+
+
+def test_partial_manifest(tmp_path):
+    manifest = Manifest(tmp_path, "test", {"a.txt": "1", "b.txt": "2"}, partial=True)
+    manifest.is_dirty("b.txt", "3")
+
+    assert manifest.stale_files() == []
+    assert json.loads(manifest.dumps())["files"] == {"a.txt": "1", "b.txt": "3"}
+
+
+def test_sharded_generation(raw_spec, tmp_path):
+    raw_spec["paths"]["/pets"]["get"]["tags"] = ["pets"]
+    raw_spec["paths"]["/pets"]["post"]["tags"] = ["store"]
+    raw_spec["paths"]["/pets"]["post"]["requestBody"]["content"]["application/json"]["schema"] = {
+        "$ref": "#/components/schemas/Owner"
+    }
+    raw_spec["components"]["schemas"]["Owner"] = {"type": "object"}
+    specs = {"v1": OpenAPI.model_validate(raw_spec, context={})}
+    expected = tmp_path / "expected"
+    ShardedCodegen().generate(specs, expected)
+
+    shard_outputs = []
+    for index in range(2):
+        generator = ShardedCodegen()
+        generator.shard, generator.shard_plan = Shard(index, 2), ShardPlan(specs, 2)
+        shard_outputs.append(tmp_path / f"shard{index}")
+        generator.generate(specs, shard_outputs[-1])
+        write_shard_metadata(shard_outputs[-1], generator.shard, generator.generator_id())
+    output = tmp_path / "output"
+    result = merge_shards(ShardedCodegen(), specs, shard_outputs, output)
+
+    files = sorted(path for path in result.written if path != MANIFEST_FILENAME)
+    assert files == sorted(p.relative_to(expected).as_posix() for p in expected.rglob("*.txt"))
+    assert all((output / path).read_bytes() == (expected / path).read_bytes() for path in files)
+    assert len(json.loads((output / MANIFEST_FILENAME).read_text())["files"]) == len(files)
+    plan = ShardPlan(specs, 2)
+    assert plan.shared_schemas("v1") == ["Pet", "NewPet", "Error"]
+    assert (shard_outputs[plan.tag_shard("v1", "store")] / "v1/models/Owner.txt").is_file()
+
+    with pytest.raises(ValueError, match="exactly once"):
+        merge_shards(ShardedCodegen(), specs, shard_outputs[:1], output)
+    with pytest.raises(ValueError, match="not the output of a shard"):
+        merge_shards(ShardedCodegen(), specs, [*shard_outputs, expected], output)
@@ -1,7 +1,12 @@
 # Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
 #
 # This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
-from datadog_api_client_generator.codegen.shared.templates_env import camel_case, snake_case
+from datadog_api_client_generator.codegen.shared.templates_env import (
+    build_default_jinja2_env,
+    camel_case,
+    filter_cache_statistics,
+    snake_case,
+)
 
 
 def test_snake_case():
@@ -26,3 +31,13 @@ def test_camel_case():
     assert camel_case("Foo__Bar") == "FooBar"
     assert camel_case("FooBar_") == "FooBar"
     assert camel_case("FooBar ") == "FooBar"
+
+
+def test_naming_filters_cache():
+    env = build_default_jinja2_env(use_bytecode_cache=False)
+    snake_case.cache_clear()
+    env.from_string("{% for name in names %}{{ name | snake_case }}{% endfor %}").render(names=["fooBarBaz"] * 3)
+
+    stats = filter_cache_statistics(env)["snake_case"]
+    assert (stats["hits"], stats["misses"], stats["currsize"]) == (2, 1, 1)
+    assert stats["hit_rate"] == 2 / 3
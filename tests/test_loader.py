@@ -0,0 +1,142 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+import json
+import pathlib
+import pickle
+import shutil
+
+import pytest
+from pydantic import ValidationError
+
+from datadog_api_client_generator.openapi.cache import SpecCache
+from datadog_api_client_generator.openapi.loader import emit_normalized, load_specs, validate_spec
+from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+from datadog_api_client_generator.openapi.operation_model import PathsItemObject
+from datadog_api_client_generator.openapi.preprocess import preprocessed_validator
+from datadog_api_client_generator.openapi.subset import Selection
+from datadog_api_client_generator.openapi.utils import load_yaml
+from datadog_api_client_generator.timings import Timings
+
+EXAMPLES = pathlib.Path(__file__).parent / "examples"
+
+
+@pytest.fixture
+def spec_paths(tmp_path):
+    paths = []
+    for version, example in (("v1", "openapi.yaml"), ("v2", "openapi-oneOf.yaml")):
+        (tmp_path / version).mkdir()
+        paths.append(shutil.copy(EXAMPLES / example, tmp_path / version / "openapi.yaml"))
+    return [pathlib.Path(p) for p in paths]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_load_specs(spec_paths, jobs):
+    specs = load_specs(spec_paths, jobs=jobs)
+
+    assert list(specs) == ["v1", "v2"]
+    assert sorted(specs["v1"].schemas_by_name()) == ["Error", "NewPet", "Pet"]
+    assert sorted(specs["v2"].schemas_by_name()) == ["Cat", "Dog", "NewPet", "Random"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_load_specs_timings(spec_paths, tmp_path, jobs):
+    timings = Timings()
+
+    load_specs(spec_paths, jobs=jobs, cache=SpecCache(tmp_path / "cache"), timings=timings)
+
+    stages = {(timing.stage, timing.version) for timing in timings.stages}
+    assert {("parse", "v1"), ("validate", "v1"), ("parse", "v2"), ("validate", "v2")} <= stages
+    assert all(timing.wall >= 0 and timing.cpu >= 0 for timing in timings.stages)
+    assert json.loads(json.dumps(timings.report()))["stages"][0]["stage"] == "cache_lookup"
+
+
+def test_load_specs_cache(spec_paths, tmp_path):
+    cache = SpecCache(tmp_path / "cache")
+
+    specs = load_specs(spec_paths, cache=cache)
+    assert len(list(cache.directory.glob("*.pickle"))) == len(spec_paths)
+
+    cached = load_specs(spec_paths, cache=cache)
+    assert cached["v1"].model_dump() == specs["v1"].model_dump()
+    assert sorted(cached["v1"].schemas_by_name()) == ["Error", "NewPet", "Pet"]
+
+
+def test_cache_eviction(spec_paths, tmp_path):
+    cache = SpecCache(tmp_path / "cache", max_size=1)
+
+    load_specs(spec_paths, cache=cache)
+    assert list(cache.directory.glob("*.pickle")) == []
+
+
+def test_validate_spec_by_section():
+    raw = load_yaml(EXAMPLES / "openapi.yaml")
+    expected = OpenAPI.model_validate(load_yaml(EXAMPLES / "openapi.yaml"), context={})
+
+    spec = validate_spec(raw)
+
+    assert spec.model_dump() == expected.model_dump()
+    assert spec.paths["/pets"].get.responses["200"].content["application/json"].schema.items().name == "Pet"
+    # Raw sections are replaced by their models as soon as they are validated.
+    assert all(isinstance(item, PathsItemObject) for item in raw["paths"].values())
+
+
+def test_load_specs_selection(spec_paths, tmp_path):
+    selection = Selection(operation_ids=frozenset({"addPet"}))
+    cache = SpecCache(tmp_path / "cache")
+
+    for _ in range(2):
+        spec = load_specs(spec_paths[:1], cache=cache, selection=selection)["v1"]
+
+        assert [(path, method) for path, method, _ in spec.operation_index().operations] == [("/pets", "post")]
+        assert sorted(spec.components.schemas) == ["Error", "NewPet", "Pet"]
+    assert sorted(load_specs(spec_paths[:1], cache=cache)["v1"].paths) == ["/pets", "/pets/{id}"]
+
+    spec = load_specs(spec_paths[1:], selection=Selection(path_prefixes=("/missing",)))["v2"]
+    assert spec.paths == {}
+    assert spec.components.schemas == {}
+
+
+def test_validate_spec_preprocessed():
+    raw = load_yaml(EXAMPLES / "openapi.yaml")
+    operation = raw["paths"]["/pets"]["get"]
+    operation["x-menu-order"] = 1
+    operation["responses"]["200"]["content"]["application/json"]["schema"]["x-nullable"] = True
+    raw["components"]["schemas"]["NewPet"]["properties"]["x-id"] = {"type": "string", "x-format": "id"}
+    expected = validate_spec(pickle.loads(pickle.dumps(raw)), preprocess=False)  # noqa: S301
+
+    spec = validate_spec(raw)
+
+    assert spec.model_dump() == expected.model_dump()
+    assert spec.paths["/pets"].get.extensions == {"x-menu-order": 1}
+    assert spec.components.schemas["NewPet"].properties["x-id"].extensions == {"x-format": "id"}
+
+
+def test_preprocessed_validator():
+    item = {"get": {"responses": {}, "x-menu-order": 1}}
+
+    # The raw node is not prepared, the validator preparing it is not called.
+    assert preprocessed_validator(PathsItemObject).validate_python(item).get.extensions == {}
+    assert PathsItemObject.__pydantic_complete__
+    assert PathsItemObject.model_validate(item).get.extensions == {"x-menu-order": 1}
+
+
+def test_validate_spec_by_section_error_location():
+    raw = load_yaml(EXAMPLES / "openapi.yaml")
+    raw["components"]["schemas"]["Error"]["required"] = "code"
+
+    with pytest.raises(ValidationError, match=r"components\.schemas\.Error\."):
+        validate_spec(raw)
+
+
+def test_load_json_and_normalized_specs(spec_paths, tmp_path):
+    expected = load_specs(spec_paths)["v1"].model_dump()
+
+    json_path = tmp_path / "json" / "v1" / "openapi.json"
+    json_path.parent.mkdir(parents=True)
+    json_path.write_text(json.dumps(load_yaml(spec_paths[0])))
+    normalized_path = emit_normalized(spec_paths[0], tmp_path / "normalized")
+
+    assert normalized_path == tmp_path / "normalized" / "v1" / "openapi.pickle"
+    for path in (json_path, normalized_path):
+        assert load_specs([path])["v1"].model_dump() == expected
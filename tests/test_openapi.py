@@ -0,0 +1,274 @@
+# Unless explicitly stated otherwise all files in this repository are licensed under the Apache 2.0 License.
+#
+# This product includes software developed at Datadog (https://www.datadoghq.com/  Copyright 2025 Datadog, Inc.
+import copy
+import pathlib
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from datadog_api_client_generator.codegen.shared.manifest import model_digest
+from datadog_api_client_generator.openapi.diff import diff_specs
+from datadog_api_client_generator.openapi.fingerprint import intern_schemas
+from datadog_api_client_generator.openapi.openapi_model import OpenAPI
+from datadog_api_client_generator.openapi.schema_model import AllOfSchema
+from datadog_api_client_generator.openapi.utils import load_yaml, resolve_refs
+
+EXAMPLES = pathlib.Path(__file__).parent / "examples"
+
+
+@pytest.fixture
+def raw_spec():
+    return load_yaml(EXAMPLES / "openapi.yaml")
+
+
+@pytest.fixture
+def spec(raw_spec):
+    return OpenAPI.model_validate(raw_spec, context={})
+
+
+def test_refs_bound_on_validation(spec):
+    pet = spec.resolve_ref("#/components/schemas/Pet")
+    schema = spec.paths["/pets/{id}"].get.responses["200"].content["application/json"].schema
+
+    assert pet.name == "Pet"
+    assert schema() is pet
+
+
+def test_unresolved_refs_reported_together(raw_spec):
+    operation = raw_spec["paths"]["/pets"]["post"]
+    operation["requestBody"]["content"]["application/json"]["schema"]["$ref"] = "#/components/schemas/Missing"
+    operation["responses"]["200"]["content"]["application/json"]["schema"]["$ref"] = "#/components/schemas/Other"
+
+    with pytest.raises(ValidationError, match="#/components/schemas/Missing, #/components/schemas/Other"):
+        OpenAPI.model_validate(raw_spec, context={})
+
+
+def test_schemas_by_name(spec):
+    assert list(spec.schemas_by_name()) == ["Pet", "NewPet", "Error"]
+    assert sorted(spec.schemas_by_name(recursive=False)) == ["Error", "NewPet", "Pet"]
+    assert list(spec.components.schemas["Pet"].schemas_by_name(include_self=False)) == ["NewPet"]
+    # Schemas come when first reached, and named roots after the schemas they reach.
+    assert list(spec.components.schemas["Pet"].schemas_by_name()) == ["NewPet", "Pet"]
+    # Schemas referenced by operations are returned whatever `include_self`.
+    assert list(spec.paths["/pets/{id}"].schemas_by_name(include_self=False)) == ["NewPet", "Pet", "Error"]
+
+
+def test_schemas_by_name_order(raw_spec):
+    schemas = raw_spec["components"]["schemas"]
+    schemas["A"] = {"type": "object", "properties": {"b": {"$ref": "#/components/schemas/B"}}}
+    schemas["B"] = {"type": "object", "properties": {"c": {"$ref": "#/components/schemas/C"}}}
+    schemas["C"] = {"type": "object", "properties": {"a": {"$ref": "#/components/schemas/A"}}}
+    spec = OpenAPI.model_validate(raw_spec, context={})
+
+    assert list(spec.components.schemas["A"].schemas_by_name()) == ["B", "C", "A"]
+    assert list(spec.components.schemas["A"].schemas_by_name(include_self=False)) == ["B", "C", "A"]
+    assert list(spec.components.schemas["A"].schemas_by_name(recursive=False)) == ["B", "A"]
+
+
+def test_schemas_by_name_form_fields(raw_spec):
+    schemas = raw_spec["components"]["schemas"]
+    schemas["File"] = {"type": "object", "properties": {"name": {"type": "string"}}}
+    schemas["Item"] = {"type": "object", "properties": {"kind": {"$ref": "#/components/schemas/En"}}}
+    schemas["En"] = {"type": "string", "enum": ["a", "b"]}
+    schemas["Out"] = {"type": "object", "properties": {"file": {"$ref": "#/components/schemas/File"}}}
+    schemas["Upload"] = {
+        "type": "object",
+        "properties": {
+            "file": {"$ref": "#/components/schemas/File"},
+            "meta": {"type": "object", "properties": {"out": {"$ref": "#/components/schemas/Out"}}},
+            "items": {"type": "array", "items": {"$ref": "#/components/schemas/Item"}},
+        },
+    }
+    raw_spec["paths"]["/upload"] = {
+        "post": {
+            "requestBody": {
+                "content": {"multipart/form-data": {"schema": {"$ref": "#/components/schemas/Upload"}}},
+            },
+            "responses": {"200": {"description": "OK"}},
+        },
+    }
+    operation = OpenAPI.model_validate(raw_spec, context={}).paths["/upload"].post
+
+    # Every form field is a root, so the schemas of inline fields are direct children.
+    assert list(operation.schemas_by_name(recursive=False, include_self=False)) == ["Out", "Item", "File"]
+    assert list(operation.schemas_by_name(include_self=False)) == ["Out", "File", "Item", "En"]
+    assert list(operation.schemas_by_name(recursive=False)) == ["File", "Out", "Item", "Upload"]
+    assert list(operation.schemas_by_name()) == ["File", "Out", "Item", "En", "Upload"]
+
+
+def test_schemas_by_name_long_ref_chain(raw_spec):
+    depth = 5000
+    schemas = raw_spec["components"]["schemas"]
+    for i in range(depth):
+        schemas[f"Chain{i}"] = {
+            "type": "object",
+            "properties": {"next": {"$ref": f"#/components/schemas/Chain{i + 1}"}},
+        }
+    schemas[f"Chain{depth}"] = {"type": "object", "properties": {"last": {"$ref": "#/components/schemas/Chain0"}}}
+    raw_spec["paths"]["/pets"]["post"]["requestBody"]["content"]["application/json"]["schema"]["$ref"] = (
+        "#/components/schemas/Chain0"
+    )
+
+    spec = OpenAPI.model_validate(raw_spec, context={})
+
+    assert len([name for name in spec.schemas_by_name() if name.startswith("Chain")]) == depth + 1
+
+
+def test_schema_graph(raw_spec):
+    raw_spec["components"]["schemas"]["NewPet"]["properties"]["parent"] = {"$ref": "#/components/schemas/Pet"}
+    graph = OpenAPI.model_validate(raw_spec, context={}).schema_graph()
+
+    assert graph.dependencies("Pet") == ("NewPet",)
+    assert graph.dependents("NewPet") == ("Pet",)
+    assert graph.dependencies("Error") == ()
+    assert graph.is_cyclic("Pet")
+    assert not graph.is_cyclic("Error")
+    assert graph.component("Pet") == {"Pet", "NewPet"}
+    assert graph.closure(["Error"], reverse=True) == {"Error"}
+
+
+def test_resolve_refs(raw_spec):
+    raw_spec["components"]["schemas"]["NewPet"]["properties"]["parent"] = {"$ref": "#/components/schemas/Pet"}
+    raw_spec["components"]["schemas"]["Alias"] = {"$ref": "#/components/schemas/Error"}
+
+    document = resolve_refs(raw_spec)
+
+    schemas = document["components"]["schemas"]
+    response = document["paths"]["/pets"]["get"]["responses"]["200"]["content"]["application/json"]
+    assert response["schema"]["items"] is schemas["Pet"]
+    assert schemas["Pet"]["allOf"][0] is schemas["NewPet"]
+    assert schemas["NewPet"]["properties"]["parent"] is schemas["Pet"]
+    assert schemas["Alias"] is schemas["Error"]
+
+
+def test_resolve_refs_circular(raw_spec):
+    raw_spec["components"]["schemas"]["A"] = {"$ref": "#/components/schemas/B"}
+    raw_spec["components"]["schemas"]["B"] = {"$ref": "#/components/schemas/A"}
+
+    with pytest.raises(ValueError, match="circular reference"):
+        resolve_refs(raw_spec)
+
+
+def test_operation_index(spec):
+    index = spec.operation_index()
+
+    assert [(path, method) for path, method, _ in spec.group_apis_by_tag()[None]] == [
+        ("/pets", "get"),
+        ("/pets", "post"),
+        ("/pets/{id}", "get"),
+        ("/pets/{id}", "delete"),
+    ]
+    spec.group_apis_by_tag()[None].clear()
+    assert spec.group_apis_by_tag()[None] == index.by_tag[None] != []
+    assert spec.get_operation("deletePet")[:2] == ("/pets/{id}", "delete")
+    assert [(path, method) for path, method, _ in index.by_path_prefix("/pets/")] == [
+        ("/pets/{id}", "get"),
+        ("/pets/{id}", "delete"),
+    ]
+    assert [path for path, _, _ in index.by_method["get"]] == ["/pets", "/pets/{id}"]
+    assert spec.operation_index() is index
+
+    spec.paths = {"/pets": spec.paths["/pets"]}
+    assert spec.get_operation("deletePet") is None
+
+
+def test_operation_memoization(spec):
+    operation = spec.paths["/pets"].post
+    parameters = operation.get_parameters()
+
+    assert [name for name, _ in parameters] == ["body"]
+    assert operation.get_parameters()[0][1] is parameters[0][1]
+    assert operation.get_accept_headers() == ["application/json"]
+    assert operation.get_return_schema() is spec.components.schemas["Pet"]
+
+    spec.invalidate_caches()
+    assert operation.get_parameters()[0][1] is not parameters[0][1]
+
+
+def test_freeze(spec):
+    frozen = spec.freeze()
+    pet = frozen.components.schemas["Pet"]
+
+    assert isinstance(frozen, OpenAPI)
+    assert isinstance(pet, AllOfSchema)
+    assert frozen.paths["/pets/{id}"].get.responses["200"].content["application/json"].schema() is pet
+    assert list(frozen.schemas_by_name()) == list(spec.schemas_by_name())
+    assert frozen.paths["/pets"].post.get_return_schema() is pet
+    assert model_digest(pet) == model_digest(spec.components.schemas["Pet"])
+    assert pet.extensions is frozen.components.schemas["Error"].extensions
+    with pytest.raises(AttributeError, match="frozen"):
+        pet.name = "Other"
+
+    restored = pickle.loads(pickle.dumps(frozen))  # noqa: S301
+    response = restored.paths["/pets/{id}"].get.responses["200"]
+    assert response.content["application/json"].schema() is restored.components.schemas["Pet"]
+
+
+def test_intern_schemas(raw_spec):
+    v1 = OpenAPI.model_validate(raw_spec, context={})
+    raw_spec["components"]["schemas"]["Error"]["properties"]["detail"] = {"type": "string"}
+    v2 = OpenAPI.model_validate(raw_spec, context={})
+    pet = v1.schema_fingerprints().component("Pet")
+
+    assert v2.schema_fingerprints().component("Pet") == pet
+    assert v2.schema_fingerprints().component("Error") != v1.schema_fingerprints().component("Error")
+
+    assert intern_schemas([v1, v2]) > 0
+    assert v2.components.schemas["Pet"] is v1.components.schemas["Pet"]
+    assert v2.components.schemas["Error"] is not v1.components.schemas["Error"]
+    assert v2.paths["/pets"].post.get_return_schema() is v1.components.schemas["Pet"]
+    assert v1.schema_fingerprints().component("Pet") == pet
+
+
+def test_schema_fingerprints_pickle(spec):
+    pet = spec.schema_fingerprints().component("Pet")
+
+    restored = pickle.loads(pickle.dumps(spec))  # noqa: S301
+
+    assert restored.schema_fingerprints()[restored.components.schemas["Pet"]] == pet
+
+
+def test_schema_fingerprints_cycle(raw_spec):
+    raw_spec["components"]["schemas"]["NewPet"]["properties"]["parent"] = {"$ref": "#/components/schemas/Pet"}
+    fingerprints = OpenAPI.model_validate(raw_spec, context={}).schema_fingerprints()
+    assert OpenAPI.model_validate(raw_spec, context={}).schema_fingerprints().component(
+        "Pet"
+    ) == fingerprints.component("Pet")
+
+    raw_spec["components"]["schemas"]["NewPet"]["properties"]["name"]["description"] = "Name of the pet."
+    changed = OpenAPI.model_validate(raw_spec, context={}).schema_fingerprints()
+    assert changed.component("Pet") != fingerprints.component("Pet")
+    assert changed.component("Error") == fingerprints.component("Error")
+
+
+def test_diff_specs(raw_spec):
+    old = OpenAPI.model_validate(copy.deepcopy(raw_spec), context={})
+    raw_spec["components"]["schemas"]["NewPet"]["properties"]["age"] = {"type": "integer"}
+    raw_spec["components"]["schemas"]["Owner"] = {"type": "object", "properties": {"name": {"type": "string"}}}
+    del raw_spec["paths"]["/pets/{id}"]["delete"]
+    new = OpenAPI.model_validate(raw_spec, context={})
+
+    result = diff_specs(old, new)
+
+    assert result.models.added == ["Owner"]
+    assert result.models.changed == ["NewPet", "Pet"]
+    assert result.operations.removed == ["deletePet"]
+    assert result.operations.changed == ["addPet", "find pet by id", "findPets"]
+    assert not diff_specs(old, old)
+
+
+def test_pickle_drops_indexes(spec):
+    spec.group_apis_by_tag()
+    spec.schema_graph()
+
+    restored = pickle.loads(pickle.dumps(spec))  # noqa: S301
+
+    assert [path for path, _, _ in restored.operation_index().by_path_prefix("/pets/")] == ["/pets/{id}", "/pets/{id}"]
+    assert list(restored.group_apis_by_tag()) == [None]
+    assert restored.schema_graph().dependencies("Pet") == ("NewPet",)
+    # Context variables cannot be pickled, the restored document sets a new one.
+    assert b"ContextVar" not in pickle.dumps(spec)
+    ref = restored.paths["/pets"].post.requestBody.content["application/json"].schema
+    assert ref() is restored.components.schemas["NewPet"]